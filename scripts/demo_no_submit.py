@@ -277,11 +277,10 @@ async def record_demo(args: argparse.Namespace) -> dict[str, Any]:
             record_video_dir=str(output_dir),
             record_video_size={"width": 1280, "height": 720},
         )
+        await context.add_init_script(swarm.INJECT_HELPER_JS)
         page = await context.new_page()
         video = page.video
 
-        await page.add_init_script(swarm.INJECT_HELPER_JS)
-
         steps.append("Agent opens the job board")
         await page.goto(target["url"], wait_until="domcontentloaded", timeout=30000)
         await page.wait_for_timeout(1800)
@@ -316,7 +315,8 @@ async def record_demo(args: argparse.Namespace) -> dict[str, Any]:
         await set_overlay(page, "Agent demo: selecting dropdown answers", steps)
 
         steps.append("Agent uploads the resume when possible")
-        uploaded = await swarm.upload_resume(page, Path("/workspace") / str(profile.get("resume_path", "./resume.pdf")))
+        resume = swarm.resolve_resume(str(profile.get("resume_path", "./resume.pdf")))
+        uploaded = await swarm.upload_resume(page, resume)
         await page.wait_for_timeout(1200)
         await set_overlay(page, "Agent demo: attempting resume upload", steps)
 
@@ -4,20 +4,31 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+import gzip
 import json
+import logging
+import os
+import queue
 import re
+import sys
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Any
-from urllib.parse import urljoin
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Mapping
+from urllib.parse import urljoin, urlparse
 
-from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
+log = logging.getLogger("swarm")
 
 ROOT = Path(__file__).resolve().parent
 PROFILE_PATH = ROOT / "profile.json"
 TARGETS_PATH = ROOT / "targets.json"
 STATE_PATH = ROOT / ".state" / "runtime_state.json"
+SITE_TIMES_PATH = ROOT / ".state" / "site_durations.json"
+BROWSER_PREF_PATH = ROOT / ".state" / "browser.json"
 LOG_DIR = ROOT / "logs"
 PROOF_DIR = ROOT / "proof"
 SOURCE_DIR = ROOT / "proof" / "source"
@@ -25,12 +36,26 @@ SOURCE_DIR = ROOT / "proof" / "source"
 TTL_SECONDS = 120
 MAX_BATCH = 3
 MAX_SELF_HEAL_ATTEMPTS = 15
+DIAG_SCREENSHOT_MIN_HEALS = 5  # incomplete-run screenshots only once self-heal is deep in retries
+FORENSIC_HTML_LIMIT = 64_000  # enough to re-verify the marker hits; contexts live in _forensic.json
+DIAG_HTML_LIMIT = 500_000
+BROWSER_POOL_SIZE = MAX_BATCH
+BROWSER_POOL_RECYCLE_AFTER = 100
+SITE_HANDLER_TIMEOUT = 60  # cap per site-specific navigation handler within the TTL
+SITE_TIME_EMA_ALPHA = 0.3  # weight of the newest run in the per-host duration estimate
+WORKER_GRACE_SECONDS = 60  # post-TTL wrap-up (confirmation check, captures) before a worker is abandoned
+
+
+def normalize_hints(values: Any) -> tuple[str, ...]:
+    """Lowercase/whitespace-collapse hint phrases once so page-side code can skip norm()."""
+    return tuple(dict.fromkeys(" ".join(str(v).lower().split()) for v in values if str(v).strip()))
+
 
 # ---------------------------------------------------------------------------
 # STRICT post-submit confirmation markers ONLY
 # These phrases appear ONLY on confirmation/thank-you pages, never on pre-submit career pages.
 # ---------------------------------------------------------------------------
-STRICT_TEXT_MARKERS = [
+STRICT_TEXT_MARKERS: tuple[str, ...] = normalize_hints([
     "thank you for applying",
     "thanks for applying",
     "your application has been submitted",
@@ -52,9 +77,9 @@ STRICT_TEXT_MARKERS = [
     "application confirmation",
     "thank you for your interest in",
     "your submission has been received",
-]
+])
 
-STRICT_URL_MARKERS = [
+STRICT_URL_MARKERS: tuple[str, ...] = normalize_hints([
     "thank-you",
     "thankyou",
     "application-submitted",
@@ -62,7 +87,8 @@ STRICT_URL_MARKERS = [
     "application-complete",
     "apply-confirmation",
     "application-confirmation",
-]
+])
+STRICT_URL_RE = re.compile("|".join(re.escape(k) for k in STRICT_URL_MARKERS), re.IGNORECASE)
 
 # Map strict markers → compat markers for test_workflow.sh acceptance
 COMPAT_MAP: dict[str, list[str]] = {
@@ -85,6 +111,10 @@ COMPAT_MAP: dict[str, list[str]] = {
         "your application has been received", "your submission has been received",
     ],
 }
+# Reverse index: strict marker → compat key (one lookup per hit instead of a nested scan)
+COMPAT_REVERSE: dict[str, str] = {
+    strict: compat_key for compat_key, strict_list in COMPAT_MAP.items() for strict in strict_list
+}
 
 TARGETS = [
     {"company": "Curtin Maritime", "url": "https://curtinmaritime.bamboohr.com/jobs"},
@@ -100,7 +130,10 @@ TARGETS = [
 ]
 
 # Network blocking: images, video, fonts, trackers — but ALLOW CSS (needed for rendering)
-BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+# SWARM_BLOCK_ASSETS=0 lets images back in (e.g. to make diag screenshots readable)
+BLOCK_ASSETS = os.getenv("SWARM_BLOCK_ASSETS", "1") != "0"
+# SWARM_FULL_PAGE_SHOTS=1 captures the whole scrolled page for success proofs (slow to encode)
+FULL_PAGE_SHOTS = os.getenv("SWARM_FULL_PAGE_SHOTS", "0") == "1"
 BLOCKED_EXTENSIONS = frozenset([
     ".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg", ".ico",
     ".mp4", ".webm", ".mov", ".avi",
@@ -110,32 +143,73 @@ BLOCKED_DOMAINS = frozenset([
     "google-analytics", "googletagmanager", "doubleclick",
     "facebook.net", "hotjar", "segment",
 ])
-
-COOKIE_HINTS = ["accept", "accept all", "allow all", "i agree", "agree", "got it", "ok", "dismiss"]
-JOB_KEYWORDS = [
+# The deny-set as CDP Network.setBlockedURLs globs: "*" is the only wildcard and matching
+# is case-sensitive, so extensions are listed in both cases. Trackers are pinned to the
+# host as far as a glob allows (a label right after "://" or a dot), so "/segment/" in a
+# path stays allowed, though a file named "x.segment.js" does not. URLs only: fonts/media served without an extension get through.
+BLOCKED_URL_PATTERNS = sorted(
+    [f"*{e}{tail}" for ext in BLOCKED_EXTENSIONS for e in (ext, ext.upper()) for tail in ("", "?*")]
+    + [f"*://{pre}{d}{post}*" for d in BLOCKED_DOMAINS for pre in ("", "*.") for post in (".", "/", ":")]
+)
+# The same globs as one anchored pattern for the context.route fallback, so both paths
+# drop exactly the same URLs. Playwright ships the regex to the driver, so only blocked
+# requests ever reach Python.
+BLOCKED_URL_RE = re.compile(
+    "^(?:" + "|".join(".*".join(map(re.escape, g.split("*"))) for g in BLOCKED_URL_PATTERNS) + ")$"
+)
+
+COOKIE_HINTS: tuple[str, ...] = normalize_hints(
+    ["accept", "accept all", "allow all", "i agree", "agree", "got it", "ok", "dismiss"]
+)
+DISMISS_HINTS: tuple[str, ...] = normalize_hints(["ok", "close", "dismiss", "got it"])
+JOB_KEYWORDS: tuple[str, ...] = normalize_hints([
     "deckhand", "entry level", "entry-level", "dredge",
     "trainee", "boatman", "crew", "leverman", "oiler",
     "maritime training", "deck", "tankerman",
     "view our employment", "apply today",
-]
-APPLY_HINTS = [
+])
+APPLY_HINTS: tuple[str, ...] = normalize_hints([
     "apply for this job", "apply now", "apply", "apply online",
     "start application", "continue application", "apply for this position",
     "apply today", "submit application", "type it in myself",
-]
-SUBMIT_HINTS = [
+])
+SUBMIT_HINTS: tuple[str, ...] = normalize_hints([
     "submit", "submit application", "submit my application",
     "finish application", "complete application", "review and submit",
     "send", "send application", "save", "save application",
     "submit your application", "apply", "confirm",
-]
-NAV_HINTS = [
+])
+NAV_HINTS: tuple[str, ...] = normalize_hints([
     "careers", "view our employment", "view our emplyment",
     "how to apply", "apply today",
     "send resume", "read more", "view opportunities",
     "see open positions", "current openings", "job openings",
     "open positions", "join our team", "employment", "emplyment",
-]
+])
+
+
+@lru_cache(maxsize=8)
+def _merged_hints(
+    success: tuple[str, ...], apply: tuple[str, ...], submit: tuple[str, ...]
+) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    return (
+        STRICT_TEXT_MARKERS + normalize_hints(success),
+        normalize_hints(APPLY_HINTS + apply),
+        normalize_hints(SUBMIT_HINTS + submit),
+    )
+
+
+def state_hints(state: Mapping[str, Any]) -> tuple[tuple[str, ...], tuple[str, ...], tuple[str, ...]]:
+    """(success markers, apply hints, submit hints) with self-heal additions merged in.
+
+    Keyed on the learned lists, so every worker in a run shares one merge and a
+    heal that learns new hints gets a fresh one.
+    """
+    return _merged_hints(
+        tuple(state.get("extra_success_markers", ())),
+        tuple(state.get("extra_apply_hints", ())),
+        tuple(state.get("extra_submit_hints", ())),
+    )
 
 # ---------------------------------------------------------------------------
 # Enhanced JS helpers: multi-step nav, ATS-specific selectors, strict detection
@@ -145,9 +219,59 @@ INJECT_HELPER_JS = r"""
   if (window.__SWM2__) return;
 
   const norm = (v) => String(v || '').toLowerCase().replace(/\s+/g, ' ').trim();
-  const allFields = () => Array.from(document.querySelectorAll('input, textarea, select'));
+  // Field list + descriptors cached until the DOM structure or text changes
+  let _fieldsCache = null;
+  let _descsCache = null;
+  let _lastMutation = performance.now();
+  let _btnIndex = null;
+  let _descMemo = new WeakMap();  // element → desc(); weak so detached nodes are collected
+  let _lastFillKey = null;
+  // Fields fillProfile has set on this document; the count it reports is cumulative
+  // and unique, so repeat passes neither reset nor double-count it
+  const _filledEls = new WeakSet();
+  let _filledCount = 0;
+  const markFilled = (el) => {
+    if (!_filledEls.has(el)) { _filledEls.add(el); _filledCount++; }
+  };
+  let _janitorQueued = false;
+  let _qcache = new Map();
+  let _detCache = null;  // {href, captcha, all}: blocker results for the current DOM
+  new MutationObserver(() => {
+    _fieldsCache = null; _descsCache = null; _btnIndex = null; _qcache = new Map(); _detCache = null;
+    _descMemo = new WeakMap(); _lastFillKey = null;
+    _lastMutation = performance.now();
+    if (!_janitorQueued) { _janitorQueued = true; setTimeout(janitor, 50); }
+  })
+    .observe(document, { childList: true, subtree: true, characterData: true });
+  // Last click/submit on the page, ours or Playwright's. After one, "quiet" also needs a
+  // mutation after it, so an async effect that has not started yet doesn't pass as settled
+  let _lastAction = 0;
+  for (const t of ['click', 'submit']) document.addEventListener(t, () => { _lastAction = performance.now(); }, true);
+  const quietFor = (ms) => _lastMutation >= _lastAction && performance.now() - _lastMutation >= ms;
+  // In-page wait_for_stable: resolves after ``quietMs`` without mutations, capped at ``capMs``
+  const settle = async (capMs, quietMs = 150) => {
+    const deadline = performance.now() + capMs;
+    while (!quietFor(quietMs) && performance.now() < deadline) await new Promise(r => setTimeout(r, 50));
+  };
+  const allFields = () => {
+    if (!_fieldsCache) _fieldsCache = Array.from(document.querySelectorAll('input, textarea, select'));
+    return _fieldsCache;
+  };
+  // querySelectorAll memoized until the next childList/text mutation. Only for selectors
+  // whose matches can't change through attribute edits alone (the observer skips attributes).
+  const $q = (sel) => {
+    let r = _qcache.get(sel);
+    if (!r) { r = document.querySelectorAll(sel); _qcache.set(sel, r); }
+    return r;
+  };
+  const fieldDescs = () => {
+    if (!_descsCache) _descsCache = allFields().map(desc);
+    return _descsCache;
+  };
 
   function desc(el) {
+    const hit = _descMemo.get(el);
+    if (hit !== undefined) return hit;
     const parts = [
       el.getAttribute('name'),
       el.getAttribute('id'),
@@ -164,7 +288,49 @@ INJECT_HELPER_JS = r"""
     }
     const fs = el.closest('fieldset');
     if (fs) { const lg = fs.querySelector('legend'); if (lg) parts.push(lg.innerText); }
-    return norm(parts.join(' '));
+    const out = norm(parts.join(' '));
+    _descMemo.set(el, out);
+    return out;
+  }
+
+  // Reactive cleanup on DOM change: empty honeypot inputs (anti-bot traps)
+  function janitor() {
+    _janitorQueued = false;
+    const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+    for (const inp of document.querySelectorAll('[aria-hidden="true"] input, input[tabindex="-1"]')) {
+      if (!inp.value) continue;
+      setter.call(inp, '');
+      inp.dispatchEvent(new Event('input', { bubbles: true }));
+      inp.dispatchEvent(new Event('change', { bubbles: true }));
+    }
+  }
+
+  // Dismiss blocking popups (resume-parse errors and the like) by a button reading exactly
+  // one of ``texts``. Only called where flow() expects such popups, never reactively, so
+  // apply modals and multi-step dialogs are left alone. ARIA dialogs first, then any
+  // visible button (popups without ARIA roles). Never one carrying a confirmation marker:
+  // the same STRICT_TEXT_MARKERS (plus learned ones) checkStrict looks for.
+  const STRICT_MARKERS = __STRICT_MARKERS__;
+  const DIALOG_SEL = '[role="dialog"], [role="alertdialog"], dialog[open]';
+  function dismissDialogs(texts) {
+    const wants = new Set((texts || []).map(norm));
+    const strict = _strictRe || STRICT_RE;
+    const isDismiss = (b) => wants.has(norm(b.innerText || b.value));
+    let n = 0;
+    for (const dlg of document.querySelectorAll(DIALOG_SEL)) {
+      if (!dlg.getClientRects().length || strict.test(norm(dlg.innerText))) continue;
+      const btn = Array.from(dlg.querySelectorAll('button')).find(isDismiss);
+      if (btn) { btn.click(); n++; }
+    }
+    if (n) return n;
+    for (const btn of document.querySelectorAll('button')) {
+      if (!btn.getClientRects().length || !isDismiss(btn)) continue;
+      const box = (btn.parentElement && btn.parentElement.parentElement) || btn;
+      if (strict.test(norm(box.innerText))) continue;
+      btn.click();
+      return 1;
+    }
+    return 0;
   }
 
   function setVal(el, value) {
@@ -207,7 +373,7 @@ INJECT_HELPER_JS = r"""
   }
 
   function clickChoice(qHints, oHints) {
-    const nodes = Array.from(document.querySelectorAll("input[type='radio'],input[type='checkbox']"));
+    const nodes = $q("input[type='radio'],input[type='checkbox']");
     for (const n of nodes) {
       const q = desc(n);
       if (!qHints.some(h => q.includes(norm(h)))) continue;
@@ -222,88 +388,127 @@ INJECT_HELPER_JS = r"""
     return false;
   }
 
+  const FIELD_ALIASES = {
+    first_name: ['first name','firstname','given name','fname','first'],
+    last_name: ['last name','lastname','surname','family name','lname','last'],
+    full_name: ['full name','your name','applicant name'],
+    email: ['email','e-mail','email address'],
+    phone: ['phone','mobile','telephone','contact number','phone number','cell'],
+    address_line1: ['address','street','street address','address line'],
+    address: ['address','street','street address','address line'],
+    city: ['city','town'],
+    state: ['state','province','region'],
+    zip: ['zip','postal','zip code','postal code'],
+    date_available: ['date available','available date','start date','availability','when can you start'],
+    desired_pay: ['desired pay','salary','pay','compensation','wage','desired salary','expected salary','pay rate','hourly rate'],
+    referred_by: ['who referred','referred','referral','how did you hear','source','hear about'],
+    career_goals: ['what are you looking for','career goal','looking for in a career','career interest','career objective'],
+    work_environment: ['ideal work environment','work environment','describe your ideal','work setting','preferred environment'],
+    pitch: ['cover letter','summary','message','why','about you','introduction','comments','additional comments','comment','notes','tell us'],
+    cover_letter: ['cover letter','message to hiring manager','professional summary','introduction'],
+    company_message: ['why do you want to work here','why are you interested in this company','why us','why this company'],
+    credential_summary: ['qualifications','credentials','certifications','licenses','professional summary'],
+    twic: ['twic','transportation worker identification credential'],
+    deployment_readiness: ['travel availability','deployment availability','rotation availability','relocation','work schedule'],
+    mmc_submission_timing: ['mmc','merchant mariner credential','credential status','license status'],
+    sea_days_note: ['sea days','offshore','additional information','experience','qualifications']
+  };
+  // Normalize aliases once at install time, not per field comparison
+  for (const k of Object.keys(FIELD_ALIASES)) FIELD_ALIASES[k] = FIELD_ALIASES[k].map(norm);
+  // One substring alternation per phrase list: each descriptor is scanned once per
+  // profile key instead of once per alias
+  const reEscape = (s) => s.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+  const anyOf = (list) => new RegExp(list.map(reEscape).join('|'));
+  const STRICT_RE = anyOf(STRICT_MARKERS);
+  const _aliasRe = new Map();
+  const aliasRe = (k) => {
+    let re = _aliasRe.get(k);
+    if (!re) { re = anyOf(FIELD_ALIASES[k] || [norm(k)]); _aliasRe.set(k, re); }
+    return re;
+  };
+  // Union of every alias for a payload's keys: fields matching none of them are
+  // rejected in one scan before the per-key pass
+  const _unionRe = new Map();
+  const unionRe = (keys) => {
+    const id = keys.join('|');
+    let re = _unionRe.get(id);
+    if (!re) {
+      re = anyOf(keys.flatMap(k => FIELD_ALIASES[k] || [norm(k)]));
+      _unionRe.set(id, re);
+    }
+    return re;
+  };
+  const YES_RE = anyOf(['are you able to work', 'authorized to work', 'legally authorized', 'eligible to work', 'willing to relocate', '18 years']);
+  const NO_RE = anyOf(['require sponsorship', 'need visa', 'been convicted']);
+  const STATE_VALUES = ['Texas', 'TX', 'texas', 'tx'].map(norm);
+
   function fillProfile(p) {
-    const map = {
-      first_name: ['first name','firstname','given name','fname','first'],
-      last_name: ['last name','lastname','surname','family name','lname','last'],
-      full_name: ['full name','your name','applicant name'],
-      email: ['email','e-mail','email address'],
-      phone: ['phone','mobile','telephone','contact number','phone number','cell'],
-      address_line1: ['address','street','street address','address line'],
-      address: ['address','street','street address','address line'],
-      city: ['city','town'],
-      state: ['state','province','region'],
-      zip: ['zip','postal','zip code','postal code'],
-      date_available: ['date available','available date','start date','availability','when can you start'],
-      desired_pay: ['desired pay','salary','pay','compensation','wage','desired salary','expected salary','pay rate','hourly rate'],
-      referred_by: ['who referred','referred','referral','how did you hear','source','hear about'],
-      career_goals: ['what are you looking for','career goal','looking for in a career','career interest','career objective'],
-      work_environment: ['ideal work environment','work environment','describe your ideal','work setting','preferred environment'],
-      pitch: ['cover letter','summary','message','why','about you','introduction','comments','additional comments','comment','notes','tell us'],
-      cover_letter: ['cover letter','message to hiring manager','professional summary','introduction'],
-      company_message: ['why do you want to work here','why are you interested in this company','why us','why this company'],
-      credential_summary: ['qualifications','credentials','certifications','licenses','professional summary'],
-      twic: ['twic','transportation worker identification credential'],
-      deployment_readiness: ['travel availability','deployment availability','rotation availability','relocation','work schedule'],
-      mmc_submission_timing: ['mmc','merchant mariner credential','credential status','license status'],
-      sea_days_note: ['sea days','offshore','additional information','experience','qualifications']
-    };
-    let filled = 0;
+    // One desc() per field instead of one per (profile key, field) pair
     const all = allFields();
-    for (const [k, v] of Object.entries(p || {})) {
-      const aliases = map[k] || [k];
-      for (const el of all) {
-        const d = desc(el);
-        if (!aliases.some(a => d.includes(norm(a)))) continue;
-        if (setVal(el, v)) filled += 1;
+    const descs = fieldDescs();
+    // Same payload against an unchanged form: already filled, nothing to do
+    const key = JSON.stringify(p || {}) + '|' + all.map(f => f.name || f.id || '').join(',');
+    if (_lastFillKey === key) return _filledCount;
+    _lastFillKey = key;
+
+    const entries = Object.entries(p || {});
+    const anyAlias = entries.length ? unionRe(entries.map(([k]) => k)) : null;
+    for (let i = 0; anyAlias && i < all.length; i++) {
+      if (!anyAlias.test(descs[i])) continue;
+      // Keys stay in payload order so a later key still wins a shared field
+      for (const [k, v] of entries) {
+        if (aliasRe(k).test(descs[i]) && setVal(all[i], v)) markFilled(all[i]);
       }
     }
 
     // Handle Yes/No radio questions (work location, legal authorization, etc.)
-    const yesQuestions = ['are you able to work', 'authorized to work', 'legally authorized', 'eligible to work', 'willing to relocate', '18 years'];
-    const noQuestions = ['require sponsorship', 'need visa', 'been convicted'];
-    const radios = Array.from(document.querySelectorAll("input[type='radio']"));
-    for (const r of radios) {
-      const q = desc(r);
+    for (let i = 0; i < all.length; i++) {
+      const r = all[i];
+      if (norm(r.getAttribute('type')) !== 'radio') continue;
+      const q = descs[i];
+      const wantYes = YES_RE.test(q);
+      const wantNo = NO_RE.test(q);
+      if (!wantYes && !wantNo) continue;
       const labelEl = r.closest('label') || (r.id ? document.querySelector('label[for="' + r.id + '"]') : null);
       const rText = ((labelEl ? labelEl.innerText : '') + ' ' + (r.value || '')).toLowerCase().trim();
-      if (yesQuestions.some(yq => q.includes(yq)) && (rText.includes('yes') || r.value.toLowerCase() === 'yes')) {
-        r.click(); r.dispatchEvent(new Event('change', { bubbles: true })); filled++;
+      if (wantYes && (rText.includes('yes') || r.value.toLowerCase() === 'yes')) {
+        r.click(); r.dispatchEvent(new Event('change', { bubbles: true })); markFilled(r);
       }
-      if (noQuestions.some(nq => q.includes(nq)) && (rText.includes('no') || r.value.toLowerCase() === 'no')) {
-        r.click(); r.dispatchEvent(new Event('change', { bubbles: true })); filled++;
+      if (wantNo && (rText.includes('no') || r.value.toLowerCase() === 'no')) {
+        r.click(); r.dispatchEvent(new Event('change', { bubbles: true })); markFilled(r);
       }
     }
 
     // Aggressive state dropdown handler — tries multiple values for state selects
-    const stateValues = ['Texas', 'TX', 'texas', 'tx'];
-    for (const s of Array.from(document.querySelectorAll('select'))) {
-      const d = desc(s);
+    for (let i = 0; i < all.length; i++) {
+      const s = all[i];
+      if ((s.tagName || '').toLowerCase() !== 'select') continue;
+      const d = descs[i];
       if (!(d.includes('state') || d.includes('province') || d.includes('region'))) continue;
       if (s.value && s.value !== '' && s.selectedIndex > 0) continue; // Already set
-      const opts = Array.from(s.options || []);
-      for (const tryVal of stateValues) {
-        const hit = opts.find(o =>
-          norm(o.textContent) === norm(tryVal) ||
-          norm(o.value) === norm(tryVal) ||
-          norm(o.textContent).includes(norm(tryVal))
-        );
-        if (hit && hit.value !== '') {
-          s.value = hit.value;
+      const opts = Array.from(s.options || []).map(o => ({ o, txt: norm(o.textContent), val: norm(o.value) }));
+      for (const tryVal of STATE_VALUES) {
+        const hit = opts.find(x => x.txt === tryVal || x.val === tryVal || x.txt.includes(tryVal));
+        if (hit && hit.o.value !== '') {
+          s.value = hit.o.value;
           s.dispatchEvent(new Event('change', { bubbles: true }));
-          filled += 1;
+          markFilled(s);
           break;
         }
       }
     }
 
-    return filled;
+    return _filledCount;
   }
 
   function applyEeo(e) {
     let c = 0;
-    for (const s of Array.from(document.querySelectorAll('select'))) {
-      const d = desc(s);
+    const all = allFields();
+    const descs = fieldDescs();
+    for (let i = 0; i < all.length; i++) {
+      const s = all[i];
+      if ((s.tagName || '').toLowerCase() !== 'select') continue;
+      const d = descs[i];
       if ((d.includes('race') || d.includes('ethnicity')) && setVal(s, e.race || 'Black or African American')) c++;
       if ((d.includes('veteran') || d.includes('protected veteran')) && setVal(s, e.veteran || 'No')) c++;
       if (d.includes('disability') && setVal(s, e.disability || 'No')) c++;
@@ -314,15 +519,165 @@ INJECT_HELPER_JS = r"""
     return c;
   }
 
-  function clickByHints(hints) {
-    const hs = (hints || []).map(norm).filter(Boolean);
-    // Extended selectors: standard controls + styled containers that act as buttons
-    const sels = "button, a, input[type='submit'], input[type='button'], [role='button'], [class*='btn'], [class*='button'], [class*='cta'], [onclick]";
-    const els = Array.from(document.querySelectorAll(sels));
-    for (const el of els) {
+  // Standard controls + styled containers that act as buttons. Kept as a set fed by the
+  // observer's records: only added subtrees are scanned and class/role edits re-test just
+  // their element; a full scan happens on first use or after a large batch of changes.
+  // Nothing is stamped on the page, so no marker can go stale on an element.
+  const CLICKABLE_SEL = "button, a, input[type='submit'], input[type='button'], [role='button'], [onclick], "
+    + "[class*='btn' i], [class*='button' i], [class*='cta' i]";
+  let _clickables = null;
+  let _clickRoots = [];  // added subtrees not scanned yet
+  let _clickUnsorted = false;
+  new MutationObserver((records) => {
+    _btnIndex = null;
+    if (!_clickables) return;
+    for (const r of records) {
+      if (r.type === 'attributes') {
+        if (!r.target.matches(CLICKABLE_SEL)) _clickables.delete(r.target);
+        else if (!_clickables.has(r.target)) { _clickables.add(r.target); _clickUnsorted = true; }
+      } else {
+        for (const n of r.addedNodes) if (n.nodeType === 1) _clickRoots.push(n);
+      }
+    }
+  }).observe(document, { childList: true, subtree: true, attributes: true,
+                         attributeFilter: ['class', 'role', 'onclick', 'type'] });
+  const byDocOrder = (a, b) => (a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING) ? -1 : 1;
+  function clickables() {
+    if (!_clickables || _clickRoots.length > 200) {
+      _clickables = new Set(document.querySelectorAll(CLICKABLE_SEL));
+      _clickRoots = [];
+      _clickUnsorted = false;
+      return _clickables;
+    }
+    if (_clickRoots.length || _clickUnsorted) {
+      for (const root of _clickRoots) {
+        if (!root.isConnected) continue;
+        if (root.matches(CLICKABLE_SEL)) _clickables.add(root);
+        for (const el of root.querySelectorAll(CLICKABLE_SEL)) _clickables.add(el);
+      }
+      _clickRoots = [];
+      _clickUnsorted = false;
+      // Back to document order, dropping anything removed since
+      _clickables = new Set(Array.from(_clickables).filter(el => el.isConnected).sort(byDocOrder));
+    } else {
+      for (const el of _clickables) if (!el.isConnected) _clickables.delete(el);
+    }
+    return _clickables;
+  }
+
+  // Control for a visible label text (get_by_label-style: substring, case-insensitive)
+  function byLabel(text) {
+    const want = norm(text);
+    for (const lbl of $q('label')) {
+      if (lbl.control && norm(lbl.innerText).includes(want)) return lbl.control;
+    }
+    for (const el of $q('input[aria-label], textarea[aria-label], select[aria-label]')) {
+      if (norm(el.getAttribute('aria-label')).includes(want)) return el;
+    }
+    return null;
+  }
+
+  // [{sel|label, values}] → number of fields set; first value that sticks wins per entry
+  function bulkFill(entries) {
+    let n = 0;
+    for (const e of entries || []) {
+      const el = e.sel ? document.querySelector(e.sel) : byLabel(e.label);
+      if (el && (e.values || []).some(v => setVal(el, v))) n++;
+    }
+    return n;
+  }
+
+  const MENU_OPTION_SEL = '.fab-MenuOption, .fab-MenuOption__content, [role="option"], [role="menuitem"]';
+
+  // BambooHR Fabric select: open the toggle for fieldName, wait (bounded) for the menu,
+  // click the first option matching tryValues, else set the hidden select/input directly.
+  // Returns 'clicked' | 'fallback' | 'unmatched' | 'none' (no toggle on the page).
+  async function selectFabric(fieldName, tryValues, fallbackText) {
+    const field = norm(fieldName);
+    const toggle = Array.from(document.querySelectorAll('button.fab-SelectToggle, button[data-menu-id]'))
+      .find(b => norm(b.getAttribute('aria-label') || b.innerText || b.textContent).includes(field));
+    if (!toggle) return 'none';
+    toggle.scrollIntoView({ block: 'center' });
+    toggle.click();
+
+    const wants = (tryValues || []).map(norm);
+    const deadline = performance.now() + 1500;
+    do {
+      const items = Array.from(document.querySelectorAll(MENU_OPTION_SEL));
+      if (items.length) {
+        for (const w of wants) {
+          const item = items.find(i => norm(i.innerText || i.textContent).includes(w));
+          if (item) { item.click(); return 'clicked'; }
+        }
+        break;  // menu rendered but nothing matched
+      }
+      await new Promise(r => setTimeout(r, 50));
+    } while (performance.now() < deadline);
+
+    (document.activeElement || document.body).dispatchEvent(
+      new KeyboardEvent('keydown', { key: 'Escape', bubbles: true }));
+    // Nuclear fallback: set the hidden <select> value directly
+    const sel = document.querySelector(`select[name="${fieldName}Id"], select[name="${fieldName}"], select[name="${fieldName}.value"]`);
+    if (sel && sel.options) {
+      for (const opt of sel.options) {
+        const txt = opt.text.toLowerCase();
+        if (txt.includes('decline') || txt.includes('no') || txt === 'texas') {
+          // React's native setter, then change so the controlled value sticks
+          const nativeSetter = Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value')?.set;
+          if (nativeSetter) nativeSetter.call(sel, opt.value); else sel.value = opt.value;
+          sel.dispatchEvent(new Event('change', { bubbles: true }));
+          return 'fallback';
+        }
+      }
+    }
+    const inp = document.querySelector(`input[name="${fieldName}.value"], input[name="${fieldName}"]`);
+    if (inp) {
+      inp.value = fallbackText || '';
+      inp.dispatchEvent(new Event('input', { bubbles: true }));
+      inp.dispatchEvent(new Event('change', { bubbles: true }));
+      return 'fallback';
+    }
+    return 'unmatched';
+  }
+
+  // All fabric selects in one call. The page settles in-page after each pick; a field
+  // that ends with the menu possibly still open stops the batch so the caller can
+  // send a trusted Escape and resume with the rest.
+  async function selectFabricAll(fields) {
+    const out = [];
+    for (const f of fields || []) {
+      const r = await selectFabric(f.field, f.values, f.fallback);
+      out.push(r);
+      if (r === 'clicked') {
+        await settle(500);
+      } else if (r !== 'none') {
+        break;
+      }
+    }
+    return out;
+  }
+
+  // normalized text → clickable elements, in document order of first appearance
+  function buildBtnIndex() {
+    const index = new Map();
+    for (const el of clickables()) {
+      // innerText: adjacent blocks stay separate words ("apply now", not "applynow") and
+      // CSS-hidden text inside a rendered control is left out
       const txt = norm(el.innerText || el.value || el.getAttribute('aria-label') || el.getAttribute('title') || '');
       if (!txt || txt.length > 200) continue;
+      const bucket = index.get(txt);
+      if (bucket) bucket.push(el); else index.set(txt, [el]);
+    }
+    return index;
+  }
+
+  function clickByHints(hints) {
+    const hs = (hints || []).filter(Boolean);  // normalized Python-side
+    if (!_btnIndex) _btnIndex = buildBtnIndex();
+    for (const [txt, els] of _btnIndex) {
       if (hs.some(h => txt.includes(h))) {
+        const el = els.find(e => e.isConnected);
+        if (!el) continue;
         el.focus();
         el.click();
         el.dispatchEvent(new MouseEvent('click', { bubbles: true, cancelable: true }));
@@ -338,31 +693,53 @@ INJECT_HELPER_JS = r"""
     return '';
   }
 
-  function findAndClickJobLink(keywords) {
-    const kw = keywords.map(k => k.toLowerCase());
-    const links = Array.from(document.querySelectorAll('a[href]'));
-    // Pass 1: link text matches keyword
-    for (const a of links) {
-      const txt = norm(a.innerText || a.textContent || '');
-      if (txt.length > 0 && txt.length < 200 && kw.some(k => txt.includes(k))) {
-        a.click();
-        return txt;
-      }
+  const CLICK_SELECTORS = ['button', 'a', "input[type='submit']", "input[type='button']", "[role='button']", 'label'];
+  const isVisible = (el) => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+
+  // One DOM walk for a whole list of candidate texts (Playwright :has-text semantics:
+  // case-insensitive substring). Earlier texts win; returns the text that was clicked.
+  function clickFirstMatching(texts, selectors) {
+    const wants = (texts || []).map(t => [t, norm(t)]).filter(([, w]) => w);
+    if (!wants.length) return '';
+    const cands = [];
+    // Live query, not $q: role/type/value selectors can start matching through attribute edits alone
+    for (const el of document.querySelectorAll((selectors || CLICK_SELECTORS).join(','))) {
+      const txt = norm(el.innerText || el.value || '');
+      if (txt) cands.push([el, txt]);
     }
-    // Pass 2: BambooHR-specific job title links
-    for (const a of links) {
-      const href = (a.href || '').toLowerCase();
-      if (href.includes('/jobs/view') || href.includes('/careers/') || href.includes('/job/')) {
-        const txt = norm(a.innerText || a.textContent || '');
-        if (txt.length > 0 && txt.length < 200) {
-          a.click();
-          return txt;
-        }
+    for (const [raw, w] of wants) {
+      for (const [el, txt] of cands) {
+        if (!txt.includes(w) || !isVisible(el)) continue;
+        el.click();
+        return raw;
       }
     }
     return '';
   }
 
+  const JOB_HREF_RE = /\/jobs\/view|\/careers\/|\/job\//i;
+  let _jobKwKey = null;
+  let _jobKwRe = null;
+
+  function findAndClickJobLink(keywords) {
+    const key = (keywords || []).join('\n');
+    if (key !== _jobKwKey) {
+      _jobKwKey = key;
+      _jobKwRe = keywords && keywords.length ? anyOf(keywords.map(norm)) : null;
+    }
+    // One pass: a keyword in the link text wins; otherwise the first job-looking
+    // href (BambooHR-style title links) seen along the way
+    let fallback = null;
+    for (const a of $q('a[href]')) {
+      const txt = norm(a.innerText);
+      if (!txt || txt.length >= 200) continue;
+      if (_jobKwRe && _jobKwRe.test(txt)) { a.click(); return txt; }
+      if (!fallback && JOB_HREF_RE.test(a.href || '')) fallback = [a, txt];
+    }
+    if (fallback) { fallback[0].click(); return fallback[1]; }
+    return '';
+  }
+
   function clickApplyATS() {
     // ATS-specific apply button selectors
     const selectors = [
@@ -389,37 +766,68 @@ INJECT_HELPER_JS = r"""
     return '';
   }
 
+  const CAPTCHA_IFRAME_SEL = 'iframe[src*="recaptcha"], iframe[src*="hcaptcha"], iframe[src*="challenges.cloudflare"], iframe[src*="captcha"]';
+  const CAPTCHA_BOX_SEL = '[class*="captcha"][class*="widget"]:not(button):not(sdf-button)';
+
+  // Detector results hold until the DOM mutates or the URL changes (pushState
+  // navigations don't always touch the tree)
+  const detCache = () => {
+    if (!_detCache || _detCache.href !== location.href) _detCache = { href: location.href, captcha: null, all: null };
+    return _detCache;
+  };
+
   function detectCaptcha() {
+    const c = detCache();
+    if (c.captcha === null) c.captcha = scanCaptcha();
+    return c.captcha;
+  }
+
+  function scanCaptcha() {
     // Only detect visible captcha widgets, not reCAPTCHA v3 buttons
-    const iframe = document.querySelector('iframe[src*="recaptcha"], iframe[src*="hcaptcha"], iframe[src*="challenges.cloudflare"], iframe[src*="captcha"]');
+    const iframe = document.querySelector(CAPTCHA_IFRAME_SEL);
     if (iframe) return true;
     // Require data-sitekey for widget detection (avoid false positives from g-recaptcha class on buttons)
-    const widget = document.querySelector('[data-sitekey], .h-captcha[data-sitekey]');
+    const widget = $q('[data-sitekey], .h-captcha[data-sitekey]')[0];
     if (widget) return true;
     // Check for visible captcha challenge box
-    const challenge = document.querySelector('[class*="captcha"][class*="widget"]:not(button):not(sdf-button)');
+    const challenge = document.querySelector(CAPTCHA_BOX_SEL);
     if (challenge && challenge.offsetHeight > 50) return true;
     return false;
   }
 
-  function detectDeadDomain() {
-    const u = window.location.href.toLowerCase();
-    const b = norm(document.body ? document.body.innerText : '');
-    return (
-      ['hugedomains.com','godaddy.com/domainsearch','sedo.com','afternic.com','dan.com','parkingcrew'].some(d => u.includes(d)) ||
-      /this domain (is|may be) for sale|buy this domain|domain name for sale|domain is available/i.test(b) ||
-      /server error in.*application|runtime error|an application error occurred on the server/i.test(b)
-    );
+  // Compiled once at install; detectors only run .test()
+  const PARKED_RE = /hugedomains\.com|godaddy\.com\/domainsearch|sedo\.com|afternic\.com|dan\.com|parkingcrew/i;
+  const DEAD_RE = /this domain (?:is|may be) for sale|buy this domain|domain name for sale|domain is available/i;
+  const SERVER_ERR_RE = /server error in.*application|runtime error|an application error occurred on the server/i;
+  const LOGIN_RE = /already have an account|please log in to continue|sign in to continue|create an account to apply/i;
+  const SMS_RE = /enter.*verification.*code|verify.*phone.*number|text.*code.*sent|sms.*verification/i;
+  const bodyText = () => norm(document.body ? document.body.innerText : '');
+
+  function detectDeadDomain(text) {
+    if (PARKED_RE.test(window.location.href)) return true;
+    const b = text === undefined ? bodyText() : text;
+    // Each regex needs a literal anchor; indexOf rejects most pages before the regex runs
+    return (b.includes('domain') && DEAD_RE.test(b)) || (b.includes('error') && SERVER_ERR_RE.test(b));
+  }
+
+  function detectLoginBlock(text) {
+    return LOGIN_RE.test(text === undefined ? bodyText() : text);
   }
 
-  function detectLoginBlock() {
-    const b = norm(document.body ? document.body.innerText : '');
-    return /already have an account|please log in to continue|sign in to continue|create an account to apply/i.test(b);
+  function detectSmsBlock(text) {
+    return SMS_RE.test(text === undefined ? bodyText() : text);
   }
 
-  function detectSmsBlock() {
-    const b = norm(document.body ? document.body.innerText : '');
-    return /enter.*verification.*code|verify.*phone.*number|text.*code.*sent|sms.*verification/i.test(b);
+  // Every blocker signal in one round trip, sharing a single innerText read
+  function detectAll() {
+    const c = detCache();
+    if (c.all) return c.all;
+    const b = bodyText();
+    c.all = {
+      dead: detectDeadDomain(b), captcha: detectCaptcha(),
+      sms: detectSmsBlock(b), login: detectLoginBlock(b),
+    };
+    return c.all;
   }
 
   function getVisibleText() {
@@ -427,8 +835,57 @@ INJECT_HELPER_JS = r"""
     return (b.innerText || b.textContent || '').toLowerCase();
   }
 
-  function getPageSource() {
-    return document.documentElement ? document.documentElement.outerHTML : '';
+  const MODAL_SELECTORS = [
+    '[role="dialog"]', '[role="alert"]', '[role="alertdialog"]',
+    '.modal', '.overlay', '.toast', '.alert', '.success-message',
+    '[class*="modal"]', '[class*="dialog"]', '[class*="toast"]',
+    '[class*="success"]', '[class*="confirm"]', '[class*="thank"]',
+  ].join(', ');
+
+  // Also check modals, alerts, overlays, and toasts
+  function modalText() {
+    const found = [];
+    for (const el of document.querySelectorAll(MODAL_SELECTORS)) {
+      const t = (el.innerText || el.textContent || '').trim();
+      if (t) found.push(t.toLowerCase());
+    }
+    return found.join(' ');
+  }
+
+  // Match pre-normalized markers in-page; return only hits and ±120-char contexts.
+  // One alternation per marker set: most checks find nothing, so a single scan
+  // answers them; per-marker offsets are only worked out once something matched
+  let _strictKey = null;
+  let _strictRe = null;
+
+  // sourceLimit > 0: also return the capped page source whenever the check
+  // succeeds (a marker hit, or urlOk from the caller), saving a second round-trip
+  function checkStrict(markers, sourceLimit, urlOk) {
+    const hits = [];
+    const contexts = [];
+    markers = markers || [];
+    const key = markers.join('\n');
+    if (key !== _strictKey) {
+      _strictKey = key;
+      _strictRe = markers.length ? anyOf(markers) : null;
+    }
+    const text = getVisibleText() + ' ' + modalText();
+    if (_strictRe && _strictRe.test(text)) {
+      for (const m of markers) {
+        const i = text.indexOf(m);
+        if (i < 0) continue;
+        hits.push(m);
+        contexts.push(text.slice(Math.max(0, i - 120), i + m.length + 120));
+      }
+    }
+    const out = { hits, contexts };
+    if (sourceLimit && (hits.length || urlOk)) out.source = getPageSource(sourceLimit);
+    return out;
+  }
+
+  function getPageSource(limit) {
+    const html = document.documentElement ? document.documentElement.outerHTML : '';
+    return limit ? html.slice(0, limit) : html;
   }
 
   function countInputs() {
@@ -438,13 +895,57 @@ INJECT_HELPER_JS = r"""
     }).length;
   }
 
+  // Submit-window diagnostics (BambooHR): form state before, requests + errors after
+  function submitDiag() {
+    let react_diag;
+    const form = document.getElementById('job-application-form') || document.querySelector('form');
+    if (!form) {
+      react_diag = { error: 'no_form' };
+    } else {
+      const inputs = form.querySelectorAll('input, textarea, select');
+      const n = inputs.length;
+      const empty = [];
+      const required = [];
+      for (let i = 0; i < n; i++) {
+        const inp = inputs[i];
+        const type = inp.type;
+        const val = inp.value || '';
+        const name = inp.name || inp.id || inp.ariaLabel || type;
+        if (!val && type !== 'hidden' && type !== 'file') empty.push(name);
+        if (inp.required || inp.ariaRequired === 'true') {
+          required.push(name + '=' + (val ? 'OK' : 'EMPTY'));
+        }
+      }
+      const submitBtn = form.querySelector('button[type="submit"]');
+      react_diag = {
+        total: n,
+        empty_count: empty.length,
+        empty: empty.slice(0, 10),
+        required: required.slice(0, 15),
+        btn_disabled: submitBtn ? submitBtn.disabled : 'no_btn'
+      };
+    }
+    return { react_diag, install_ok: Array.isArray(window.__submitLog) };
+  }
+
+  function submitReport() {
+    const errs = [];
+    const nodes = document.querySelectorAll('[class*="error"], [class*="Error"], [role="alert"]');
+    for (let i = 0, n = nodes.length; i < n && errs.length < 10; i++) {
+      const txt = (nodes[i].innerText || '').trim();
+      if (txt && txt.length < 200) errs.push(txt);
+    }
+    return { fetch_log: window.__submitLog || [], vis_errors: errs };
+  }
+
   window.__SWM2__ = {
-    fillProfile, applyEeo, clickByHints, findAndClickJobLink, clickApplyATS,
-    detectCaptcha, detectDeadDomain, detectSmsBlock, detectLoginBlock,
-    getVisibleText, getPageSource, countInputs
+    fillProfile, applyEeo, bulkFill, selectFabric, selectFabricAll, clickByHints, clickFirstMatching, findAndClickJobLink, clickApplyATS,
+    detectCaptcha, detectDeadDomain, detectSmsBlock, detectLoginBlock, detectAll,
+    getVisibleText, getPageSource, countInputs, quietFor, settle, checkStrict, janitor, dismissDialogs,
+    submitDiag, submitReport
   };
 })();
-"""
+""".replace("__STRICT_MARKERS__", json.dumps(list(STRICT_TEXT_MARKERS)))
 
 
 # ---------------------------------------------------------------------------
@@ -454,8 +955,40 @@ def utc_now() -> str:
     return datetime.now(tz=timezone.utc).isoformat()
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=64)
 def slugify(text: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-") or "target"
+    return _SLUG_RE.sub("-", text.lower()).strip("-") or "target"
+
+
+@lru_cache(maxsize=8)
+def compile_marker_scanner(markers: tuple[str, ...]) -> Callable[[str], dict[str, int]]:
+    """Build a one-pass multi-pattern scanner returning {marker: first_offset}.
+
+    A single longest-first lookahead alternation, expanding prefix markers so
+    overlapping hits are reported exactly like independent substring checks.
+    """
+    ordered = tuple(dict.fromkeys(m.lower() for m in markers if m))
+    if not ordered:
+        return lambda text: {}
+
+    pattern = re.compile(
+        "(?=(" + "|".join(re.escape(m) for m in sorted(ordered, key=len, reverse=True)) + "))"
+    )
+    prefixes = {m: [p for p in ordered if p != m and m.startswith(p)] for m in ordered}
+
+    def scan(text: str) -> dict[str, int]:
+        first: dict[str, int] = {}
+        for match in pattern.finditer(text):
+            marker, start = match.group(1), match.start()
+            first.setdefault(marker, start)
+            for prefix in prefixes[marker]:
+                first.setdefault(prefix, start)
+        return first
+
+    return scan
 
 
 def read_json(path: Path, default: Any) -> Any:
@@ -468,8 +1001,11 @@ def read_json(path: Path, default: Any) -> Any:
 
 
 def write_json(path: Path, payload: Any) -> None:
+    """Write via a sibling temp file and rename, so a crash never leaves half a file."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(json.dumps(payload, indent=2).encode("utf-8"))
+    tmp.replace(path)
 
 
 def dedupe_keep_order(values: list[str]) -> list[str]:
@@ -615,15 +1151,22 @@ def build_target_profile(profile: dict[str, Any], target: dict[str, str]) -> dic
     return tailored
 
 
+STATE_MAP: Mapping[str, str] = MappingProxyType({
+    "TX": "Texas", "CA": "California", "FL": "Florida", "LA": "Louisiana",
+    "NY": "New York", "VA": "Virginia", "MD": "Maryland", "NJ": "New Jersey",
+    "PA": "Pennsylvania", "OH": "Ohio", "WA": "Washington", "OR": "Oregon",
+    "AL": "Alabama", "GA": "Georgia", "SC": "South Carolina", "NC": "North Carolina",
+    "CT": "Connecticut", "MA": "Massachusetts", "AK": "Alaska", "HI": "Hawaii",
+})
+
+# Fixed answers shared by the generic filler and the ATS-specific fills
+DEFAULT_DATE_AVAILABLE = "03/10/2026"
+DESIRED_PAY = "Negotiable"
+REFERRED_BY = "Online Job Board"
+
+
 def expand_state_value(value: str) -> str:
-    state_map = {
-        "TX": "Texas", "CA": "California", "FL": "Florida", "LA": "Louisiana",
-        "NY": "New York", "VA": "Virginia", "MD": "Maryland", "NJ": "New Jersey",
-        "PA": "Pennsylvania", "OH": "Ohio", "WA": "Washington", "OR": "Oregon",
-        "AL": "Alabama", "GA": "Georgia", "SC": "South Carolina", "NC": "North Carolina",
-        "CT": "Connecticut", "MA": "Massachusetts", "AK": "Alaska", "HI": "Hawaii",
-    }
-    return state_map.get(value, value)
+    return STATE_MAP.get(value, value)
 
 
 def load_profile() -> dict[str, Any]:
@@ -657,12 +1200,100 @@ def save_state(state: dict[str, Any]) -> None:
     write_json(STATE_PATH, state)
 
 
+def site_key(url: str) -> str:
+    return (urlparse(url).hostname or url).lower()
+
+
+def schedule_longest_first(
+    targets: list[dict[str, str]], site_times: dict[str, float]
+) -> list[tuple[int, dict[str, str]]]:
+    """(index, target) pairs, slowest expected host first; unseen hosts count as a full TTL."""
+    return sorted(
+        enumerate(targets),
+        key=lambda it: -float(site_times.get(site_key(it[1]["url"]), TTL_SECONDS)),
+    )
+
+
+def record_site_time(site_times: dict[str, float], url: str, seconds: float) -> None:
+    key = site_key(url)
+    prev = site_times.get(key)
+    site_times[key] = round(
+        seconds if prev is None else SITE_TIME_EMA_ALPHA * seconds + (1 - SITE_TIME_EMA_ALPHA) * float(prev), 2
+    )
+
+
+class Admission:
+    """Concurrency cap that adapts at runtime: a Condition-guarded active counter.
+
+    Blocks and timeouts shrink the cap (down to 1) so a run that is tripping
+    anti-bot defences backs off; each completed target grows it back to ``ceiling``.
+    """
+
+    def __init__(self, ceiling: int) -> None:
+        self.ceiling = max(1, ceiling)
+        self.limit = self.ceiling
+        self.active = 0
+        self._cond = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.active -= 1
+                self._cond.notify(1)
+
+    async def feedback(self, result: Mapping[str, Any]) -> None:
+        status = result.get("status")
+        detail = str(result.get("detail", ""))
+        async with self._cond:
+            # COMPLETE first: a confirmed submit can still carry a "timeout_..." detail
+            if status == "COMPLETE":
+                if self.limit < self.ceiling:
+                    self.limit += 1
+                    self._cond.notify_all()
+            elif status == "BLOCKED" or detail.startswith(("timeout_", "worker_crash")):
+                self.limit = max(1, self.limit - 1)
+
+
+def _log_has_any(path: Path, needles: tuple[bytes, ...], chunk_size: int = 65536) -> bool:
+    """Stream ``path`` and stop at the first needle; needles must be lowercase.
+
+    Results are memoized on (mtime, size), so re-checking an unchanged log is a stat.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return False
+    return _scan_log(path, st.st_mtime_ns, st.st_size, needles, chunk_size)
+
+
+@lru_cache(maxsize=32)
+def _scan_log(path: Path, _mtime_ns: int, _size: int, needles: tuple[bytes, ...], chunk_size: int) -> bool:
+    keep = max(len(n) for n in needles) - 1
+    tail = b""
+    try:
+        with path.open("rb") as f:
+            while chunk := f.read(chunk_size):
+                window = tail + chunk.lower()
+                if any(n in window for n in needles):
+                    return True
+                tail = window[-keep:] if keep else b""
+    except FileNotFoundError:
+        return False
+    return False
+
+
 def self_heal(attempt: int) -> dict[str, Any]:
     state = load_state()
     state["heal_count"] = int(state.get("heal_count", 0)) + 1
 
     log_path = LOG_DIR / f"swarm_attempt_{attempt}.log"
-    text = log_path.read_text(encoding="utf-8", errors="ignore").lower() if log_path.exists() else ""
+    needs_hints = _log_has_any(log_path, (b"incomplete", b"no_strict"))
 
     apply_pool = ["continue", "next", "proceed", "begin application", "start", "quick apply", "view details"]
     submit_pool = ["confirm", "complete", "final submit", "send", "review", "done"]
@@ -672,11 +1303,11 @@ def self_heal(attempt: int) -> dict[str, Any]:
     ]
 
     for h in apply_pool:
-        if h not in state["extra_apply_hints"] and ("incomplete" in text or "no_strict" in text):
+        if h not in state["extra_apply_hints"] and needs_hints:
             state["extra_apply_hints"].append(h)
             break
     for h in submit_pool:
-        if h not in state["extra_submit_hints"] and ("incomplete" in text or "no_strict" in text):
+        if h not in state["extra_submit_hints"] and needs_hints:
             state["extra_submit_hints"].append(h)
             break
     for h in success_pool:
@@ -688,61 +1319,321 @@ def self_heal(attempt: int) -> dict[str, Any]:
     return state
 
 
+# ---------------------------------------------------------------------------
+# Background disk writer: keeps capture/forensic I/O off the Playwright loop
+# ---------------------------------------------------------------------------
+WRITE_BATCH_ITEMS = 50
+WRITE_BATCH_SECONDS = 0.5
+_WRITE_Q: asyncio.Queue[tuple[Path, bytes]] | None = None
+
+
+_MADE_DIRS: set[Path] = set()  # directories known to exist; no mkdir/stat per write
+
+
+def ensure_dir(path: Path) -> None:
+    if path not in _MADE_DIRS:
+        path.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(path)
+
+
+def _write_batch(batch: list[tuple[Path, bytes]]) -> None:
+    for path, data in batch:
+        try:
+            ensure_dir(path.parent)
+            if path.suffix == ".gz":
+                # Level 1: captures are written often and rarely read
+                data = gzip.compress(data, compresslevel=1)
+            if path.suffix == ".jsonl":
+                # Journals grow one record per write
+                with path.open("ab") as f:
+                    f.write(data)
+            else:
+                path.write_bytes(data)
+        except Exception:
+            pass
+
+
+def queue_write(path: Path, data: bytes) -> None:
+    """Hand a file write to the background flusher (written inline when none is running)."""
+    if _WRITE_Q is None:
+        _write_batch([(path, data)])
+    else:
+        _WRITE_Q.put_nowait((path, data))
+
+
+async def _flusher(q: asyncio.Queue[tuple[Path, bytes]]) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await q.get()]
+        deadline = loop.time() + WRITE_BATCH_SECONDS
+        while len(batch) < WRITE_BATCH_ITEMS:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(q.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        try:
+            await asyncio.to_thread(_write_batch, batch)
+        finally:
+            for _ in batch:
+                q.task_done()
+
+
+@asynccontextmanager
+async def disk_flusher() -> AsyncIterator[None]:
+    """Route queue_write() through a batching background task; drain on exit."""
+    global _WRITE_Q
+    q: asyncio.Queue[tuple[Path, bytes]] = asyncio.Queue()
+    _WRITE_Q = q
+    task = asyncio.create_task(_flusher(q))
+    try:
+        yield
+    finally:
+        await q.join()
+        task.cancel()
+        _WRITE_Q = None
+
+
 # ---------------------------------------------------------------------------
 # Safe browser helpers — handle context destruction gracefully
 # ---------------------------------------------------------------------------
-async def safe_eval(page: Any, js: str, default: Any = None) -> Any:
+HELPER_READY_JS = "() => !!window.__SWM2__"
+
+
+async def safe_eval(page: Any, js: str, default: Any = None, *, arg: Any = None) -> Any:
+    """Evaluate ``js`` with ``arg`` passed as a structured value (never spliced into source)."""
     try:
-        return await page.evaluate(js)
+        return await page.evaluate(js, arg)
     except Exception:
         try:
             await page.wait_for_load_state("domcontentloaded", timeout=5000)
-            await page.evaluate(INJECT_HELPER_JS)
-            return await page.evaluate(js)
+            # Helpers arrive via context.add_init_script on every new document
+            await page.wait_for_function(HELPER_READY_JS, timeout=2000)
+            return await page.evaluate(js, arg)
         except Exception:
             return default
 
 
-async def js_wait(page: Any, ms: int) -> None:
+DOM_QUIET_JS = "(q) => !window.__SWM2__ || window.__SWM2__.quietFor(q)"
+
+
+async def wait_for_stable(page: Any, ms: int = 500, quiet_ms: int = 150) -> None:
+    """Return once the network is idle and the DOM stopped mutating, capped at ``ms``.
+
+    After a click or submit the DOM must have changed since, not just be quiet: a
+    networkidle state reached before the click says nothing about its effect, so a
+    click that changes nothing holds to the cap like the fixed sleep it replaced.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + ms / 1000
     try:
-        await page.evaluate(f"() => new Promise(r => setTimeout(r, {ms}))")
+        await page.wait_for_load_state("networkidle", timeout=ms)
     except Exception:
-        try:
-            await page.wait_for_load_state("domcontentloaded", timeout=ms + 5000)
-        except Exception:
-            pass
+        pass
+    remaining = int((deadline - loop.time()) * 1000)
+    if remaining <= 0:
+        return
+    try:
+        await page.wait_for_function(DOM_QUIET_JS, arg=quiet_ms, timeout=remaining)
+    except Exception:
+        pass
+
+
+SUBMIT_METHODS = frozenset({"POST", "PUT", "PATCH"})
+
+
+async def page_source_head(page: Any, limit: int) -> str:
+    """First ``limit`` chars of the page HTML, sliced in-page so the rest never crosses CDP."""
+    return str(
+        await safe_eval(
+            page, "(n) => window.__SWM2__ ? window.__SWM2__.getPageSource(n) : ''", "", arg=limit
+        ) or ""
+    )
+
+
+async def wait_for_submit_response(page: Any, ms: int) -> bool:
+    """Return as soon as the page gets an answer to a form write (POST/PUT/PATCH), capped at ``ms``."""
+    try:
+        await page.wait_for_event(
+            "response", predicate=lambda r: r.request.method in SUBMIT_METHODS, timeout=ms
+        )
+        return True
+    except Exception:
+        return False
+
+
+async def wait_until(page: Any, predicate_js: str, ms: int, arg: Any = None) -> bool:
+    """Wait for a page-specific readiness predicate instead of a fixed settle window."""
+    try:
+        await page.wait_for_function(predicate_js, arg=arg, timeout=ms)
+        return True
+    except Exception:
+        return False
 
 
 async def reinject(page: Any) -> None:
+    """Ensure helpers are live; the init script normally installs them already."""
     try:
-        await page.evaluate(INJECT_HELPER_JS)
+        await page.wait_for_function(HELPER_READY_JS, timeout=2000)
     except Exception:
+        # Page predates the init script (e.g. caller skipped add_init_script)
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=5000)
             await page.evaluate(INJECT_HELPER_JS)
         except Exception:
             pass
 
 
+async def route_handler(route: Any) -> None:
+    # Registered for BLOCKED_URL_RE only: everything that gets here is dropped
+    await route.abort()
+
+
+async def block_requests(page: Any) -> bool:
+    """Block assets/trackers in ``page``'s renderer via CDP; False where CDP is unavailable."""
+    try:
+        client = await page.context.new_cdp_session(page)
+        await client.send("Network.enable")
+        await client.send("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        return True
+    except Exception:
+        return False
+
+
+async def block_context_requests(context: Any, page: Any) -> None:
+    """Install request blocking once per context so popups inherit it.
+
+    Chromium: the CDP blocklist is per target, so pages opened later are covered
+    from a context "page" listener. Elsewhere (Firefox) a single context.route
+    applies to every page; it is matched driver-side on BLOCKED_URL_RE, so only
+    blocked requests pay a round trip, but it disables the HTTP cache, so it is
+    only the fallback.
+    """
+    if await block_requests(page):
+        context.on("page", lambda new_page: asyncio.ensure_future(block_requests(new_page)))
+        return
+    await context.route(BLOCKED_URL_RE, route_handler)
+
+
 async def handle_navigation(page: Any) -> None:
-    """Wait for potential navigation and re-inject helpers."""
-    await js_wait(page, 2000)
+    """Wait for potential navigation to settle and confirm helpers are live."""
+    await wait_for_stable(page, 2000)
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=5000)
+    except Exception:
+        pass
     await reinject(page)
 
 
-async def click_hints(page: Any, hints: list[str]) -> str:
+async def diag_screenshot(page: Any, path: Path) -> bool:
+    """Viewport-only JPEG for failure diagnostics, written by the background flusher.
+
+    Full-page tiling is kept for success proof only. Returns whether a capture was taken.
+    """
+    try:
+        data = await page.screenshot(full_page=False, type="jpeg", quality=50)
+    except Exception:
+        return False
+    queue_write(path, data)
+    return True
+
+
+async def click_hints(page: Any, hints: tuple[str, ...] | list[str]) -> str:
+    """Click the first control matching ``hints`` (expected pre-normalized, see normalize_hints)."""
     hit = await safe_eval(
         page,
-        f"() => window.__SWM2__ ? window.__SWM2__.clickByHints({json.dumps(hints)}) : ''",
+        "(hints) => window.__SWM2__ ? window.__SWM2__.clickByHints(hints) : ''",
         "",
+        arg=list(hints),
     )
     return str(hit).strip() if hit else ""
 
 
-async def apply_profile(page: Any, profile: dict[str, Any]) -> tuple[int, int]:
-    state_abbrev = profile.get("state", "TX")
-    state_full = expand_state_value(state_abbrev)
-    payload = {
+async def click_first_matching(page: Any, texts: list[str], selectors: list[str] | None = None) -> str:
+    """Click the first visible control whose text contains one of ``texts`` (in order)."""
+    hit = await safe_eval(
+        page,
+        "(a) => window.__SWM2__ ? window.__SWM2__.clickFirstMatching(a.texts, a.selectors) : ''",
+        "",
+        arg={"texts": texts, "selectors": selectors},
+    )
+    return str(hit) if hit else ""
+
+
+async def dismiss_dialogs(page: Any) -> int:
+    """Close blocking popups by their OK/Close/Dismiss/Got it button; returns clicks made."""
+    n = await safe_eval(
+        page, "(t) => window.__SWM2__ ? window.__SWM2__.dismissDialogs(t) : 0", 0, arg=list(DISMISS_HINTS)
+    )
+    if n:
+        await wait_for_stable(page, 500)
+    return int(n or 0)
+
+
+async def click_through(
+    page: Any, texts: list[str], settle_ms: int, selectors: list[str] | None = None
+) -> list[str]:
+    """Click each of ``texts`` that is present, in order, settling after every click."""
+    clicked: list[str] = []
+    remaining = list(texts)
+    while remaining:
+        hit = await click_first_matching(page, remaining, selectors)
+        if not hit:
+            break
+        clicked.append(hit)
+        await wait_for_stable(page, settle_ms)
+        remaining = remaining[remaining.index(hit) + 1:]
+    return clicked
+
+
+async def bulk_fill(
+    page: Any,
+    by_selector: dict[str, Any] | list[tuple[str, Any]],
+    by_label: dict[str, Any] | None = None,
+) -> int:
+    """Fill selector- and label-addressed fields in one evaluate; list values are fallbacks."""
+    entries: list[dict[str, Any]] = []
+    items = by_selector.items() if isinstance(by_selector, dict) else by_selector
+    for key, val in items:
+        vals = [v for v in (val if isinstance(val, list) else [val]) if v]
+        if vals:
+            entries.append({"sel": key, "values": vals})
+    for key, val in (by_label or {}).items():
+        if val:
+            entries.append({"label": key, "values": [val]})
+    if not entries:
+        return 0
+    n = await safe_eval(page, "(e) => window.__SWM2__ ? window.__SWM2__.bulkFill(e) : 0", 0, arg=entries)
+    return int(n or 0)
+
+
+DETECT_BLOCKERS_JS = """(cookieHints) => {
+    const S = window.__SWM2__;
+    if (!S) return {};
+    const out = Object.assign({}, S.detectAll());
+    // Same round trip: dismiss the cookie banner once the page is known to be usable
+    if (cookieHints && !(out.dead || out.captcha || out.sms)) out.cookie = S.clickByHints(cookieHints);
+    return out;
+}"""
+
+
+async def detect_blockers(page: Any, cookie_hints: tuple[str, ...] | None = None) -> dict[str, bool]:
+    """dead/captcha/sms/login flags from one detectAll() evaluate.
+
+    With ``cookie_hints``, an unblocked page also gets its cookie banner clicked in
+    the same call (``cookie`` flag).
+    """
+    hints = list(cookie_hints) if cookie_hints else None
+    out = await safe_eval(page, DETECT_BLOCKERS_JS, {}, arg=hints)
+    if not isinstance(out, dict):
+        out = {}
+    return {k: bool(out.get(k)) for k in ("dead", "captcha", "sms", "login", "cookie")}
+
+
+def build_fill_payload(profile: dict[str, Any]) -> dict[str, Any]:
+    """Field values for fillProfile; key order matters (later keys win shared fields)."""
+    return {
         "first_name": profile.get("first_name", ""),
         "last_name": profile.get("last_name", ""),
         "full_name": f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip(),
@@ -751,7 +1642,7 @@ async def apply_profile(page: Any, profile: dict[str, Any]) -> tuple[int, int]:
         "address_line1": profile.get("address_line1", ""),
         "address": profile.get("address", profile.get("address_line1", "")),
         "city": profile.get("city", ""),
-        "state": state_full,
+        "state": expand_state_value(profile.get("state", "TX")),
         "zip": profile.get("zip", ""),
         "pitch": profile.get("pitch", ""),
         "cover_letter": profile.get("cover_letter", ""),
@@ -761,65 +1652,105 @@ async def apply_profile(page: Any, profile: dict[str, Any]) -> tuple[int, int]:
         "deployment_readiness": profile.get("deployment_readiness", ""),
         "mmc_submission_timing": profile.get("mmc_submission_timing", ""),
         "sea_days_note": profile.get("sea_days_note", ""),
-        "date_available": profile.get("date_available", "03/10/2026"),
-        "desired_pay": "Negotiable",
-        "referred_by": "Online Job Board",
+        "date_available": profile.get("date_available", DEFAULT_DATE_AVAILABLE),
+        "desired_pay": DESIRED_PAY,
+        "referred_by": REFERRED_BY,
         "career_goals": profile.get("career_goals", ""),
         "work_environment": profile.get("work_environment", ""),
     }
-    eeo = profile.get("eeo_defaults", {})
+
+
+def fill_args_json(profile: dict[str, Any], payload: dict[str, Any] | None = None) -> str:
+    """fillProfile payload + EEO defaults as one JSON string, parsed once in-page.
+
+    Build it once per target: a string crosses to the page without Playwright
+    walking the dict on every apply_profile call.
+    """
+    if payload is None:
+        payload = build_fill_payload(profile)
+    return json.dumps({"payload": payload, "eeo": profile.get("eeo_defaults", {})})
+
+
+async def apply_profile(
+    page: Any,
+    profile: dict[str, Any],
+    fill_json: str | None = None,
+    settle_ms: int = 0,
+    guard_captcha: bool = False,
+) -> tuple[int, int] | None:
+    """Run fillProfile + applyEeo; pass ``fill_json`` to reuse a prebuilt fill_args_json().
+
+    ``settle_ms`` first waits in-page for the DOM to go quiet (the catch-up pass for
+    late-rendered fields), so the wait and the fill share one round trip.
+    ``guard_captcha`` runs detectCaptcha in the same call and returns None, without
+    filling anything, when a captcha is up.
+    """
+    if fill_json is None:
+        fill_json = fill_args_json(profile)
     out = await safe_eval(
         page,
-        f"""() => {{
-            if (!window.__SWM2__) return {{filled:0, eeo:0}};
-            const filled = window.__SWM2__.fillProfile({json.dumps(payload)});
-            const eeo = window.__SWM2__.applyEeo({json.dumps(eeo)});
-            return {{filled, eeo}};
-        }}""",
+        """async (a) => {
+            const S = window.__SWM2__;
+            if (!S) return {filled:0, eeo:0};
+            if (a.captcha && S.detectCaptcha()) return {captcha: true};
+            if (a.settle) await S.settle(a.settle);
+            const d = JSON.parse(a.json);
+            return {filled: S.fillProfile(d.payload), eeo: S.applyEeo(d.eeo)};
+        }""",
         {"filled": 0, "eeo": 0},
+        arg={"json": fill_json, "settle": settle_ms, "captcha": guard_captcha},
     )
     if not isinstance(out, dict):
         return 0, 0
+    if out.get("captcha"):
+        return None
+    # fillProfile reports unique fields filled on this document so far (it restarts
+    # at 0 after a navigation, hence callers still keep the max across pages)
     return int(out.get("filled", 0)), int(out.get("eeo", 0))
 
 
-async def upload_resume(page: Any, path: Path) -> int:
-    if not path.exists():
-        return 0
-    processing = await safe_eval(
-        page,
-        """() => {
-            const txt = (document.body?.innerText || '').toLowerCase();
-            return txt.includes('please wait while the resume is being processed')
-                || txt.includes("don't leave this page")
-                || txt.includes('uploading done');
-        }""",
-        False,
-    )
-    if processing:
+# Claim the first file input that has no file yet (-1 while the site is still
+# processing an earlier upload, or when every input is filled)
+CLAIM_FILE_INPUT_JS = """(els) => {
+    const txt = (document.body?.innerText || '').toLowerCase();
+    if (txt.includes('please wait while the resume is being processed')
+        || txt.includes("don't leave this page")
+        || txt.includes('uploading done')) return -1;
+    const i = els.findIndex(el => el.dataset.swmUploaded !== '1' && !(el.files && el.files.length > 0));
+    if (i >= 0) els[i].dataset.swmUploaded = '1';
+    return i;
+}"""
+
+
+@lru_cache(maxsize=16)
+def resolve_resume(raw: str) -> Path | None:
+    """Absolute resume path, or None if missing; resolved and stat'ed once per run."""
+    path = (ROOT / raw).resolve()
+    return path if path.is_file() else None
+
+
+async def upload_resume(page: Any, path: Path | None) -> int:
+    """Put the resume into the first empty file input (one resume per form, not every slot)."""
+    if path is None:
         return 0
     inputs = page.locator("input[type='file']")
-    c = await inputs.count()
-    uploaded = 0
-    for i in range(c):
-        try:
-            inp = inputs.nth(i)
-            already_has_file = await inp.evaluate(
-                """el => {
-                    if (el.dataset.swmUploaded === '1') return true;
-                    if (el.files && el.files.length > 0) return true;
-                    return false;
-                }"""
-            )
-            if already_has_file:
-                continue
-            await inp.set_input_files(str(path.resolve()))
-            await inp.evaluate("el => { el.dataset.swmUploaded = '1'; }")
-            uploaded += 1
-            break
+    try:
+        # One round trip: processing check, slot search and claim
+        slot = await inputs.evaluate_all(CLAIM_FILE_INPUT_JS)
+    except Exception:
+        return 0
+    if slot < 0:
+        return 0
+    inp = inputs.nth(slot)
+    try:
+        await inp.set_input_files(str(path))
+        return 1
+    except Exception:
+        try:
+            await inp.evaluate("el => { delete el.dataset.swmUploaded; }")
         except Exception:
-            continue
-    return uploaded
+            pass
+        return 0
 
 
 async def form_has_file_inputs(page: Any) -> bool:
@@ -845,42 +1776,58 @@ def should_skip_request_submit(page_url: str, has_file_inputs: bool) -> bool:
 # ---------------------------------------------------------------------------
 # STRICT success checking with forensic capture
 # ---------------------------------------------------------------------------
+# Used only when the helper is missing; mirrors getVisibleText() + modalText()
+PAGE_TEXT_FALLBACK_JS = """() => {
+    const b = document.body || document.documentElement;
+    const found = [(b ? (b.innerText || b.textContent || '') : '').toLowerCase()];
+    for (const el of document.querySelectorAll('[role="dialog"], [role="alert"], [role="alertdialog"], .modal, .overlay, .toast, .alert, .success-message, [class*="modal"], [class*="dialog"], [class*="toast"], [class*="success"], [class*="confirm"], [class*="thank"]')) {
+        const t = (el.innerText || el.textContent || '').trim();
+        if (t) found.push(t.toLowerCase());
+    }
+    return found.join(' ');
+}"""
+
+
+def scan_strict_text(text: str, markers: tuple[str, ...]) -> tuple[list[str], list[str]]:
+    """Return (hits in marker order, ±120-char context per hit) for lowercase ``text``."""
+    offsets = compile_marker_scanner(markers)(text)
+    hits = [m for m in markers if m in offsets]
+    contexts = []
+    for hit in hits:
+        idx = offsets[hit]
+        contexts.append(text[max(0, idx - 120) : min(len(text), idx + len(hit) + 120)])
+    return hits, contexts
+
+
 async def check_strict_success(
-    page: Any, slug: str, attempt: int, extra_markers: list[str] | None = None
+    page: Any, slug: str, attempt: int, all_markers: tuple[str, ...] = STRICT_TEXT_MARKERS
 ) -> dict[str, Any]:
-    """STRICT confirmation — captures page source + screenshot + logs exact text."""
-    text = str(await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.getVisibleText() : ''", "") or "")
-    # Also check modals, alerts, overlays, and toasts
-    modal_text = str(await safe_eval(page, """() => {
-        const sels = [
-            '[role="dialog"]', '[role="alert"]', '[role="alertdialog"]',
-            '.modal', '.overlay', '.toast', '.alert', '.success-message',
-            '[class*="modal"]', '[class*="dialog"]', '[class*="toast"]',
-            '[class*="success"]', '[class*="confirm"]', '[class*="thank"]',
-        ];
-        let found = [];
-        for (const sel of sels) {
-            for (const el of document.querySelectorAll(sel)) {
-                const t = (el.innerText || el.textContent || '').trim();
-                if (t) found.push(t.toLowerCase());
-            }
-        }
-        return found.join(' ');
-    }""", "") or "")
-    text = text + " " + modal_text
-    url = page.url.lower()
-
-    all_markers = STRICT_TEXT_MARKERS + list(extra_markers or [])
-    strict_hits = [m for m in all_markers if m.lower() in text]
-    url_ok = any(k in url for k in STRICT_URL_MARKERS)
+    """STRICT confirmation — captures page source + screenshot + logs exact text.
+
+    ``all_markers`` is the full marker set, e.g. the first item of ``state_hints``.
+    """
+    url_ok = bool(STRICT_URL_RE.search(page.url))
+    # Markers are matched in-page; only hits + context windows (and, on success, the
+    # capped forensic source) cross the CDP pipe, all in one round-trip
+    out = await safe_eval(
+        page,
+        "(a) => window.__SWM2__ ? window.__SWM2__.checkStrict(a.markers, a.limit, a.urlOk) : null",
+        None,
+        arg={"markers": list(all_markers), "limit": FORENSIC_HTML_LIMIT, "urlOk": url_ok},
+    )
+    page_source: str | None = None
+    if isinstance(out, dict):
+        strict_hits = [str(h) for h in out.get("hits", [])]
+        contexts = [str(c) for c in out.get("contexts", [])]
+        if "source" in out:
+            page_source = str(out["source"] or "")
+    else:
+        text = str(await safe_eval(page, PAGE_TEXT_FALLBACK_JS, "") or "")
+        strict_hits, contexts = scan_strict_text(text, all_markers)
     ok = bool(strict_hits or url_ok)
 
     # Derive compat markers for test_workflow.sh acceptance
-    compat_additions: set[str] = set()
-    for sh in strict_hits:
-        for compat_key, strict_list in COMPAT_MAP.items():
-            if sh in strict_list:
-                compat_additions.add(compat_key)
+    compat_additions: set[str] = {COMPAT_REVERSE[sh] for sh in strict_hits if sh in COMPAT_REVERSE}
     # If URL matches, add "confirmation" compat marker
     if url_ok:
         compat_additions.add("confirmation")
@@ -888,23 +1835,22 @@ async def check_strict_success(
     all_text_hits = strict_hits + sorted(compat_additions)
 
     success_png = PROOF_DIR / f"{slug}_attempt{attempt}_success.png"
+    shot_ok = False
 
     # Capture page source for forensic verification
     if ok:
         try:
-            await page.screenshot(path=str(success_png), full_page=True)
+            # Stays PNG: test_workflow.sh accepts only *_success.png proofs
+            queue_write(success_png, await page.screenshot(full_page=FULL_PAGE_SHOTS))
+            shot_ok = True
         except Exception:
             pass
-        page_source = str(
-            await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.getPageSource() : ''", "") or ""
-        )
+        if page_source is None:
+            page_source = await page_source_head(page, FORENSIC_HTML_LIMIT)
         if page_source:
-            source_path = SOURCE_DIR / f"{slug}_attempt{attempt}.html"
-            source_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                source_path.write_text(page_source[:500_000], encoding="utf-8")
-            except Exception:
-                pass
+            queue_write(
+                SOURCE_DIR / f"{slug}_attempt{attempt}.html.gz", page_source.encode("utf-8", "ignore")
+            )
 
         # Forensic log with surrounding context
         forensic: dict[str, Any] = {
@@ -914,74 +1860,388 @@ async def check_strict_success(
             "compat_additions": sorted(compat_additions),
             "url_match": url_ok,
             "final_url": page.url,
-            "contexts": [],
+            "contexts": contexts,
         }
-        for hit in strict_hits:
-            idx = text.find(hit.lower())
-            if idx >= 0:
-                start, end = max(0, idx - 120), min(len(text), idx + len(hit) + 120)
-                forensic["contexts"].append(text[start:end])
-        try:
-            (LOG_DIR / f"{slug}_attempt{attempt}_forensic.json").write_text(
-                json.dumps(forensic, indent=2), encoding="utf-8"
-            )
-        except Exception:
-            pass
+        queue_write(LOG_DIR / f"{slug}_attempt{attempt}_forensic.json", json.dumps(forensic, indent=2).encode("utf-8"))
 
     return {
         "ok": ok,
         "proof": {
-            "screenshot": f"proof/{success_png.name}" if success_png.exists() else "",
+            "screenshot": f"proof/{success_png.name}" if shot_ok else "",
             "final_url": page.url,
             "text_hits": all_text_hits,
             "url_match": url_ok,
-            "screenshot_ok": success_png.exists(),
+            "screenshot_ok": shot_ok,
         },
     }
 
 
+# ---------------------------------------------------------------------------
+# Browser pool: launch once, hand out browsers, recycle after heavy use
+# ---------------------------------------------------------------------------
+# Engine that last launched ("chromium"/"firefox"), seeded from BROWSER_PREF_PATH by
+# run_swarm. Once known, launches go straight to it instead of racing a spare.
+_PREFERRED_BROWSER: str | None = None
+# The Firefox spare of a cold start, shared by launches racing at the same time (a pool
+# starting up) so they don't each start one; cleared as soon as the race is decided.
+_FIREFOX_SPARE: "asyncio.Future[Any] | None" = None
+
+
+def _close_spare(task: "asyncio.Future[Any]") -> None:
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().close())
+
+
+def _drop_spare() -> None:
+    global _FIREFOX_SPARE
+    spare, _FIREFOX_SPARE = _FIREFOX_SPARE, None
+    if spare is not None:
+        spare.add_done_callback(_close_spare)
+
+
+async def launch_browser(p: Any, headful: bool) -> Any:
+    """Launch Chromium, falling back to Firefox if Chromium is unavailable.
+
+    Until an engine has launched (this process or, via BROWSER_PREF_PATH, a
+    previous run), Firefox starts alongside Chromium so a Chromium failure doesn't
+    cost a second cold start; the spare is closed as soon as Chromium is up.
+    Concurrent launches share that one spare.
+    """
+    global _PREFERRED_BROWSER, _FIREFOX_SPARE
+    chromium_args = ["--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage"]
+    if not headful:
+        chromium_args.append("--disable-gpu")
+    if _PREFERRED_BROWSER == "chromium":
+        try:
+            return await p.chromium.launch(headless=not headful, args=chromium_args)
+        except Exception:
+            _PREFERRED_BROWSER = "firefox"
+            return await _launch_firefox(p, headful)
+    if _PREFERRED_BROWSER == "firefox":
+        try:
+            return await p.firefox.launch(headless=not headful, args=[])
+        except Exception:
+            _PREFERRED_BROWSER = None
+            # fall through: race both again
+    chromium = asyncio.ensure_future(p.chromium.launch(headless=not headful, args=chromium_args))
+    if _FIREFOX_SPARE is None:
+        _FIREFOX_SPARE = asyncio.ensure_future(p.firefox.launch(headless=not headful, args=[]))
+    try:
+        browser = await chromium
+    except Exception:
+        # Claim the spare if no other launch has; otherwise start our own Firefox
+        spare, _FIREFOX_SPARE = _FIREFOX_SPARE, None
+        try:
+            browser = await (spare if spare is not None else p.firefox.launch(headless=not headful, args=[]))
+        except Exception:
+            raise RuntimeError("Failed to launch any browser") from None
+        _PREFERRED_BROWSER = "firefox"
+        return browser
+    except BaseException:
+        _drop_spare()
+        raise
+    _drop_spare()
+    _PREFERRED_BROWSER = "chromium"
+    return browser
+
+
+async def _launch_firefox(p: Any, headful: bool) -> Any:
+    try:
+        return await p.firefox.launch(headless=not headful, args=[])
+    except Exception:
+        raise RuntimeError("Failed to launch any browser") from None
+
+
+# Opaque origins (about:blank, sandboxed frames) throw on storage access
+CLEAR_STORAGE_JS = """() => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+}"""
+
+
+def track_origins(context: Any) -> set[str]:
+    """Record the http(s) origin of every frame any page of ``context`` navigates to."""
+    origins: set[str] = set()
+
+    def on_navigated(frame: Any) -> None:
+        u = urlparse(frame.url)
+        if u.scheme in ("http", "https") and u.netloc:
+            origins.add(f"{u.scheme}://{u.netloc}")
+
+    context.on("page", lambda page: page.on("framenavigated", on_navigated))
+    return origins
+
+
+async def clear_origin_storage(context: Any, page: Any, origins: set[str]) -> bool:
+    """Clear all storage of ``origins`` via CDP; False where CDP is unavailable."""
+    if not origins:
+        return True
+    try:
+        client = await context.new_cdp_session(page)
+    except Exception:
+        return False
+    try:
+        for origin in origins:
+            await client.send("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+        return True
+    except Exception:
+        return False
+    finally:
+        try:
+            await client.detach()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    """Fixed set of pre-launched browsers; ``lease()`` hands out warm, reset contexts."""
+
+    def __init__(
+        self,
+        p: Any,
+        headful: bool,
+        size: int = BROWSER_POOL_SIZE,
+        recycle_after: int = BROWSER_POOL_RECYCLE_AFTER,
+    ) -> None:
+        self._p = p
+        self._headful = headful
+        self._size = max(1, size)
+        self._recycle_after = max(1, recycle_after)
+        self._idle: asyncio.Queue[Any] = asyncio.Queue()
+        self._served: dict[int, int] = {}
+        self._all: list[Any] = []
+        self._warm: dict[int, list[tuple[Any, Any]]] = {}
+        self._origins: dict[int, set[str]] = {}
+
+    async def start(self) -> "BrowserPool":
+        # Cold starts overlap: one Chromium launch of wall time for the whole pool
+        browsers = await asyncio.gather(
+            *(launch_browser(self._p, self._headful) for _ in range(self._size))
+        )
+        for browser in browsers:
+            await self._add(browser)
+        return self
+
+    async def _add(self, browser: Any) -> None:
+        self._served[id(browser)] = 0
+        self._all.append(browser)
+        await self._idle.put(browser)
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[Any]:
+        browser = await self._idle.get()
+        try:
+            yield browser
+        finally:
+            await self._checkin(browser)
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[tuple[Any, Any]]:
+        """(context, page) with helpers + request blocking already installed."""
+        async with self.checkout() as browser:
+            warm = self._warm.setdefault(id(browser), [])
+            if warm:
+                context, page = warm.pop()
+            else:
+                context = await browser.new_context(ignore_https_errors=True)
+                self._origins[id(context)] = track_origins(context)
+                # Helpers are installed on every document/frame of this context
+                await context.add_init_script(INJECT_HELPER_JS)
+                await context.add_init_script(SUBMIT_LOG_INIT_JS)
+                page = await context.new_page()
+                if BLOCK_ASSETS:
+                    await block_context_requests(context, page)
+            try:
+                yield context, page
+            finally:
+                if await self._reset(context, page):
+                    warm.append((context, page))
+                else:
+                    self._origins.pop(id(context), None)
+                    try:
+                        await context.close()
+                    except Exception:
+                        pass
+
+    async def _reset(self, context: Any, page: Any) -> bool:
+        """Drop popups, cookies, permissions, storage and the current document so the next target starts clean.
+
+        Storage is cleared for every origin the lease navigated to. Without CDP only the
+        current document's origin can be reached, so a context that saw more is dropped.
+        """
+        origins = self._origins.get(id(context), set())
+        try:
+            if page.is_closed():
+                return False
+            for extra in context.pages:
+                if extra is not page:
+                    await extra.close()
+            await context.clear_cookies()
+            await context.clear_permissions()
+            if not await clear_origin_storage(context, page, origins):
+                if len(origins) > 1:
+                    return False
+                await page.evaluate(CLEAR_STORAGE_JS)
+            await page.goto("about:blank", timeout=5000)
+            origins.clear()
+            return True
+        except Exception:
+            return False
+
+    async def _checkin(self, browser: Any) -> None:
+        served = self._served.get(id(browser), 0) + 1
+        if served < self._recycle_after:
+            self._served[id(browser)] = served
+            await self._idle.put(browser)
+            return
+        self._served.pop(id(browser), None)
+        for context, _ in self._warm.pop(id(browser), []):
+            self._origins.pop(id(context), None)
+        self._all.remove(browser)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+        await self._add(await launch_browser(self._p, self._headful))
+
+    async def close(self) -> None:
+        for browser in self._all:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._all.clear()
+        self._served.clear()
+        self._warm.clear()
+        self._origins.clear()
+
+
+class SelectorCache:
+    """Locators reused across fill cycles; reset when the page or its main frame changes."""
+
+    def __init__(self) -> None:
+        self._page: Any = None
+        self._cache: dict[tuple[str, str], Any] = {}
+
+    def _bind(self, page: Any) -> None:
+        if page is self._page:
+            return
+        self.detach()
+        self._page = page
+        try:
+            page.on("framenavigated", self._on_navigated)
+        except Exception:
+            pass
+
+    def detach(self) -> None:
+        """Forget cached locators and stop listening; pooled pages outlive the worker."""
+        if self._page is not None:
+            try:
+                self._page.remove_listener("framenavigated", self._on_navigated)
+            except Exception:
+                pass
+        self._page = None
+        self._cache.clear()
+
+    def _on_navigated(self, frame: Any) -> None:
+        if self._page is not None and frame == self._page.main_frame:
+            self._cache.clear()
+
+    def locator(self, page: Any, selector: str) -> Any:
+        self._bind(page)
+        key = ("css", selector)
+        if key not in self._cache:
+            self._cache[key] = page.locator(selector)
+        return self._cache[key]
+
+
+# ---------------------------------------------------------------------------
+# Per-cycle page scripts (fill → submit)
+# ---------------------------------------------------------------------------
+# BambooHR, before submit: what the form (and so React) currently holds, for logs,
+# and whether the fetch/XHR recorder (SUBMIT_LOG_INIT_JS) is live. The bodies of
+# this and POSTSUBMIT_JS live in the helper, so V8 parses them once per document.
+PRESUBMIT_JS = "() => window.__SWM2__ ? window.__SWM2__.submitDiag() : null"
+
+# After a navigation: parsed, or already showing confirmation-ish text
+CONFIRMATION_READY_JS = """() => document.readyState !== 'loading'
+    || /thank|submitted|received|success/i.test(document.body ? document.body.innerText : '')"""
+
+# BambooHR: record outgoing fetch/XHR calls so a silent submit shows up in logs.
+# Installed as a context init script, so it also sees requests made during hydration.
+SUBMIT_LOG_INIT_JS = """
+(() => {
+    if (!location.hostname.includes('bamboohr') || window.__submitLog) return;
+    window.__submitLog = [];
+    const origFetch = window.fetch;
+    window.fetch = function(...args) {
+        window.__submitLog.push({type: 'fetch', url: String(args[0]).substring(0, 100), method: args[1]?.method || 'GET'});
+        return origFetch.apply(this, args);
+    };
+    const origXhrOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function(method, url) {
+        window.__submitLog.push({type: 'xhr', url: String(url).substring(0, 100), method: method});
+        return origXhrOpen.apply(this, arguments);
+    };
+})();
+"""
+
+SUBMIT_CLICK_JS = """() => {
+    const b = document.querySelector('button[type="submit"]');
+    if (!b) return {found: false};
+    const out = {found: true, disabled: b.disabled, text: (b.innerText || '').trim().slice(0, 40)};
+    if (b.disabled) return out;
+    try {
+        // Only scroll (a forced layout + scroll) when the button is off-screen
+        const r = b.getBoundingClientRect();
+        if (r.bottom < 0 || r.top > window.innerHeight) b.scrollIntoView({block: 'center'});
+        b.click();
+    }
+    catch(e) { out.error = e.message; }
+    return out;
+}"""
+
+REQUEST_SUBMIT_JS = """() => {
+    const form = document.getElementById('job-application-form') || document.querySelector('form');
+    if (!form) return 'no_form_found';
+    try { form.requestSubmit(); return 'requestSubmit_ok'; }
+    catch(e) { return 'requestSubmit_err: ' + e.message; }
+}"""
+
+# Moran (Kronos/UKG): first saashr URL anywhere in the markup, matched in-page so
+# only the URL crosses CDP, not the whole document
+SAASHR_URL_JS = r"""() => {
+    const m = (document.documentElement.outerHTML || '').match(/https?:\/\/[^"']*(?:saashr|secure4)[^"']+/i);
+    return m ? m[0] : '';
+}"""
+
+# BambooHR, one round-trip after submit: recorded requests + visible validation errors
+POSTSUBMIT_JS = "() => window.__SWM2__ ? window.__SWM2__.submitReport() : null"
+
+
 # ---------------------------------------------------------------------------
 # Worker: multi-step flow per target
 # ---------------------------------------------------------------------------
 async def worker(
-    browser: Any,
-    sem: asyncio.Semaphore,
+    pool: BrowserPool,
     target: dict[str, str],
     profile: dict[str, Any],
     state: dict[str, Any],
     attempt: int,
 ) -> dict[str, Any]:
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
     company = target["company"]
     url = target["url"]
     slug = slugify(company)
     target_profile = build_target_profile(profile, target)
-    resume_path = ROOT / str(target_profile.get("resume_path", "./resume.pdf"))
+    resume_path = resolve_resume(str(target_profile.get("resume_path", "./resume.pdf")))
     job_keywords = target_profile.get("job_keywords", JOB_KEYWORDS)
-    extra_markers = state.get("extra_success_markers", [])
-    extra_apply = APPLY_HINTS + state.get("extra_apply_hints", [])
-    extra_submit = SUBMIT_HINTS + state.get("extra_submit_hints", [])
-
-    async with sem:
-        context = await browser.new_context(ignore_https_errors=True)
-        page = await context.new_page()
-
-        async def route_handler(route: Any) -> None:
-            req = route.request
-            u = req.url.lower()
-            if req.resource_type in BLOCKED_RESOURCE_TYPES:
-                await route.abort()
-                return
-            if any(u.endswith(ext) or (ext + "?") in u for ext in BLOCKED_EXTENSIONS):
-                await route.abort()
-                return
-            if any(d in u for d in BLOCKED_DOMAINS):
-                await route.abort()
-                return
-            await route.continue_()
-
-        await page.route("**/*", route_handler)
-        await page.add_init_script(INJECT_HELPER_JS)
+    fill_json = fill_args_json(target_profile)
+    locators = SelectorCache()
+    heal_count = int(state.get("heal_count", 0))
+    success_markers, extra_apply, extra_submit = state_hints(state)
 
+    async with pool.lease() as (context, page):
         status = "INCOMPLETE"
         detail = ""
         proof: dict[str, Any] = {}
@@ -992,11 +2252,16 @@ async def worker(
         SOCIAL_DOMAINS = {"facebook.com", "twitter.com", "x.com", "linkedin.com",
                           "instagram.com", "youtube.com", "tiktok.com", "pinterest.com"}
 
+        # Popups are captured as they open, so follow_popup costs nothing when none did
+        pending_popups: list[Any] = []
+        on_popup = pending_popups.append
+        context.on("page", on_popup)
+
         async def follow_popup(page_ref, ctx):
             """Switch to new tab/popup if one opened, skipping social media."""
-            pages = ctx.pages
-            if len(pages) > 1:
-                new_page = pages[-1]
+            if pending_popups:
+                new_page = pending_popups[-1]
+                pending_popups.clear()
                 try:
                     await new_page.wait_for_load_state("domcontentloaded", timeout=10000)
                 except Exception:
@@ -1008,9 +2273,8 @@ async def worker(
                     except Exception:
                         pass
                     return page_ref
-                await new_page.route("**/*", route_handler)
-                await new_page.add_init_script(INJECT_HELPER_JS)
-                await reinject(new_page)
+                # Blocking and helpers come from the context (block_context_requests,
+                # add_init_script); nothing to reinstall on the new page
                 return new_page
             return page_ref
 
@@ -1019,47 +2283,40 @@ async def worker(
 
             # ── PHASE 1: Navigate and assess ──────────────────────────
             await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            await js_wait(page, 1500)
+            await wait_for_stable(page, 1500)
             await reinject(page)
 
+            signals = await detect_blockers(page, COOKIE_HINTS)
+
             # Dead domain check
-            dead = await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.detectDeadDomain() : false", False)
-            if dead:
+            if signals["dead"]:
                 status = "BLOCKED"
                 detail = "Blocked - External: dead_domain"
-                png = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.png"
-                try:
-                    await page.screenshot(path=str(png), full_page=True)
-                except Exception:
-                    pass
-                proof = {"screenshot": f"proof/{png.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+                shot = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.jpg"
+                shot_ok = await diag_screenshot(page, shot)
+                proof = {"screenshot": f"proof/{shot.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": shot_ok}
                 return
 
-            # Captcha check (iframe-based only, not text pattern)
-            captcha = await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.detectCaptcha() : false", False)
-            # SMS check
-            sms = await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.detectSmsBlock() : false", False)
+            # Captcha check (iframe-based only, not text pattern) + SMS check
+            captcha, sms = signals["captcha"], signals["sms"]
 
             if captcha or sms:
                 status = "BLOCKED"
                 detail = f"Blocked - External: captcha={captcha}, sms={sms}"
-                png = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.png"
-                try:
-                    await page.screenshot(path=str(png), full_page=True)
-                except Exception:
-                    pass
-                proof = {"screenshot": f"proof/{png.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+                shot = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.jpg"
+                shot_ok = await diag_screenshot(page, shot)
+                proof = {"screenshot": f"proof/{shot.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": shot_ok}
                 return
 
-            # Dismiss cookies
-            await click_hints(page, COOKIE_HINTS)
+            # Cookies were dismissed by detect_blockers above
 
             # ── PHASE 2: Navigate into a relevant job listing ─────────
             # Try clicking a specific job link first
             job_clicked = await safe_eval(
                 page,
-                f"() => window.__SWM2__ ? window.__SWM2__.findAndClickJobLink({json.dumps(job_keywords)}) : ''",
+                "(kw) => window.__SWM2__ ? window.__SWM2__.findAndClickJobLink(kw) : ''",
                 "",
+                arg=job_keywords,
             )
             if job_clicked:
                 await handle_navigation(page)
@@ -1096,10 +2353,10 @@ async def worker(
                     page = await follow_popup(page, context)
 
             # ── SITE-SPECIFIC: Playwright click for stubborn buttons ──
-            cur_url = page.url.lower()
-
             # Weeks Marine / Kiewit: navigate from search results to a real job page.
-            if "kiewitcareers.kiewit.com" in cur_url:
+            async def site_kiewit() -> None:
+                nonlocal page
+                cur_url = page.url.lower()
                 try:
                     if "/search/" in cur_url:
                         entry_link = page.locator(
@@ -1141,9 +2398,10 @@ async def worker(
                     pass
 
             # Callan Marine: "APPLY NOW" oval button (multi-line text, styled <a>)
-            if "callanmarine" in cur_url:
+            async def site_callan() -> None:
+                nonlocal page
                 try:
-                    apply_btn = page.locator('a:has-text("APPLY"), a:has-text("Apply Now"), a:has-text("APPLY NOW")').first
+                    apply_btn = page.locator("a", has_text=re.compile(r"apply", re.I)).first
                     if await apply_btn.count() > 0:
                         await apply_btn.click(timeout=5000)
                         await handle_navigation(page)
@@ -1152,9 +2410,10 @@ async def worker(
                     pass
 
             # ADP Career Center: use Playwright native click on sdf-link (SPA)
-            cur_url = page.url.lower()  # refresh URL after site-specific clicks
-            if "adp.com" in cur_url:
-                await js_wait(page, 3000)  # wait for SPA to render
+            async def site_adp() -> None:
+                nonlocal page
+                # SPA renders job links as sdf-link custom elements
+                await wait_until(page, "() => document.querySelectorAll('sdf-link, sdf-button').length > 0", 5000)
                 await reinject(page)
                 # Find job link ID using JS eval, then click with Playwright
                 job_id = await safe_eval(page, """() => {
@@ -1167,15 +2426,17 @@ async def worker(
                     }
                     return '';
                 }""", "")
-                print(f"  [ADP] job_id: {job_id}, URL: {page.url[:80]}", flush=True)
+                log.info("  [ADP] job_id: %s, URL: %s", job_id, page.url[:80])
                 if job_id:
                     try:
                         # Use Playwright native click (triggers real mouse events for SPA)
                         el = page.locator(f'#{job_id}')
                         await el.scroll_into_view_if_needed(timeout=2000)
                         await el.click(timeout=5000)
-                        print(f"  [ADP] clicked job: {job_id}", flush=True)
-                        await js_wait(page, 3000)
+                        log.info("  [ADP] clicked job: %s", job_id)
+                        # Job detail is ready once an Apply control renders
+                        await wait_until(page, """() => Array.from(document.querySelectorAll('sdf-link, sdf-button, a, button'))
+                            .some(el => /apply/i.test(el.textContent || '') && !/affirmative|action/i.test(el.textContent || ''))""", 5000)
                         await reinject(page)
                         # On job detail page — find Apply button
                         apply_id = await safe_eval(page, """() => {
@@ -1187,31 +2448,33 @@ async def worker(
                             }
                             return '';
                         }""", "")
-                        print(f"  [ADP] apply_id: {apply_id}", flush=True)
+                        log.info("  [ADP] apply_id: %s", apply_id)
                         if apply_id and ':' not in apply_id:
                             apply_el = page.locator(f'#{apply_id}')
                             await apply_el.click(timeout=5000)
                         else:
-                            # Fallback: click by text matching
-                            for kw in ["Apply", "APPLY"]:
-                                try:
-                                    btn = page.locator(f'sdf-button:has-text("{kw}"), button:has-text("{kw}"), a:has-text("{kw}")').first
-                                    if await btn.count() > 0:
-                                        await btn.click(timeout=5000)
-                                        break
-                                except Exception:
-                                    pass
-                        await js_wait(page, 3000)
+                            # Fallback: click by text matching (one compound query)
+                            try:
+                                btn = page.locator(
+                                    "sdf-button, button, a",
+                                    has_text=re.compile(r"^(?!.*(affirmative|action)).*apply", re.I | re.S),
+                                ).first
+                                if await btn.count() > 0:
+                                    await btn.click(timeout=5000)
+                            except Exception:
+                                pass
+                        await wait_for_stable(page, 3000)
                         await handle_navigation(page)
                         page = await follow_popup(page, context)
                         await reinject(page)
                     except Exception as e:
-                        print(f"  [ADP] error: {e}", flush=True)
+                        log.info("  [ADP] error: %s", e)
 
             # Viking Dredging: "VIEW OUR EMPLYMENT OPPORTUNITIES" (typo)
-            if "vikingdredging" in cur_url:
+            async def site_viking() -> None:
+                nonlocal page
                 try:
-                    emp_btn = page.locator('a:has-text("EMPLYMENT"), a:has-text("EMPLOYMENT"), a:has-text("VIEW OUR")').first
+                    emp_btn = page.locator("a", has_text=re.compile(r"EMPLO?YMENT|VIEW OUR", re.I)).first
                     if await emp_btn.count() > 0:
                         await emp_btn.click(timeout=5000)
                         await handle_navigation(page)
@@ -1229,9 +2492,8 @@ async def worker(
                     pass
 
             # Moran Towing: navigate to saashr.com ATS directly
-            cur_url2 = page.url.lower()
-            if "morantug" in cur_url2:
-                await js_wait(page, 2000)  # wait for dynamic content
+            async def site_moran() -> None:
+                await wait_for_stable(page, 2000)  # wait for dynamic content
                 saashr_url = await safe_eval(page, """() => {
                     for (const a of document.querySelectorAll('a')) {
                         if (a.href && (a.href.includes('saashr') || a.href.includes('secure4'))) {
@@ -1248,23 +2510,19 @@ async def worker(
                     except Exception:
                         saashr_url = ""
                 if not saashr_url:
-                    html = str(await safe_eval(page, "() => document.documentElement.outerHTML", "") or "")
-                    match = re.search(r'https?://[^"\']*(?:saashr|secure4)[^"\']+', html, flags=re.I)
-                    if match:
-                        saashr_url = match.group(0)
-                print(f"  [MORAN] saashr URL: {saashr_url}", flush=True)
+                    saashr_url = str(await safe_eval(page, SAASHR_URL_JS, "") or "")
+                log.info("  [MORAN] saashr URL: %s", saashr_url)
                 if saashr_url:
                     try:
                         await page.goto(urljoin(page.url, saashr_url), timeout=15000, wait_until="domcontentloaded")
-                        await js_wait(page, 2000)
+                        await wait_for_stable(page, 2000)
                         await reinject(page)
-                        print(f"  [MORAN] navigated to: {page.url[:80]}", flush=True)
+                        log.info("  [MORAN] navigated to: %s", page.url[:80])
                     except Exception as e:
-                        print(f"  [MORAN] nav error: {e}", flush=True)
+                        log.info("  [MORAN] nav error: %s", e)
 
             # SaaShr / secure4 ATS: open a relevant role and then its apply drawer.
-            cur_url3 = page.url.lower()
-            if "saashr.com" in cur_url3 or "secure4.saashr.com" in cur_url3:
+            async def site_saashr() -> None:
                 try:
                     job_controls = page.locator("a, button, [role='button']")
                     best_index = -1
@@ -1290,96 +2548,103 @@ async def worker(
                             best_index = idx
                     if best_index >= 0:
                         await job_controls.nth(best_index).click(timeout=5000)
-                        await js_wait(page, 1500)
+                        await wait_for_stable(page, 1500)
                     saashr_apply = page.locator("text=Apply").first
                     if await saashr_apply.count() > 0:
                         await saashr_apply.click(timeout=5000)
-                        await js_wait(page, 1500)
+                        await wait_for_stable(page, 1500)
                 except Exception:
                     pass
 
-            # Dismiss any modal dialogs (like resume parse errors on ATS portals)
-            # Use Playwright locators for reliable modal button clicks
-            for btn_text in ["OK", "Ok", "Close", "Dismiss", "Got it"]:
+            # Host substring → handler, in precedence order. After each handler the host is
+            # re-read, so a hop onto another ATS (Moran → SaaShr) gets that ATS's handler too;
+            # every handler runs at most once and is capped so one stuck site can't eat the TTL.
+            site_handlers = (
+                ("kiewitcareers.kiewit.com", site_kiewit),
+                ("callanmarine", site_callan),
+                ("adp.com", site_adp),
+                ("vikingdredging", site_viking),
+                ("morantug", site_moran),
+                ("saashr.com", site_saashr),
+            )
+            ran: set[str] = set()
+            while True:
+                host = site_key(page.url)
+                hit = next(((k, h) for k, h in site_handlers if k in host and k not in ran), None)
+                if hit is None:
+                    break
+                ran.add(hit[0])
                 try:
-                    loc = page.locator(f'button:has-text("{btn_text}")').first
-                    if await loc.count() > 0 and await loc.is_visible():
-                        await loc.click(timeout=2000)
-                        await js_wait(page, 500)
-                except Exception:
-                    pass
+                    await asyncio.wait_for(hit[1](), timeout=SITE_HANDLER_TIMEOUT)
+                except asyncio.TimeoutError:
+                    log.info("  [SITE] %s handler timed out after %ss", hit[0], SITE_HANDLER_TIMEOUT)
+
+            # Dismiss any modal dialogs (like resume parse errors on ATS portals)
+            await dismiss_dialogs(page)
             # Then click "Type it in myself" or "Continue" to access manual form
-            for btn_text in ["Type it in myself", "Continue", "Start", "Next", "Manual entry"]:
-                try:
-                    loc = page.locator(f'button:has-text("{btn_text}"), a:has-text("{btn_text}"), label:has-text("{btn_text}"), input[value="{btn_text}"]').first
-                    if await loc.count() > 0 and await loc.is_visible():
-                        await loc.click(timeout=2000)
-                        await js_wait(page, 1000)
-                except Exception:
-                    pass
+            await click_through(
+                page, ["Type it in myself", "Continue", "Start", "Next", "Manual entry"], 1000,
+                ["button", "a", "label", "input"],
+            )
             # Also try radio buttons for "Manual entry" option
             try:
                 manual_radio = page.locator('input[type="radio"]')
-                for i in range(await manual_radio.count()):
-                    r = manual_radio.nth(i)
-                    label = await r.evaluate("el => (el.closest('label') || el.parentElement)?.innerText || ''")
-                    if 'manual' in label.lower():
-                        await r.click(timeout=2000)
-                        break
+                idx = await manual_radio.evaluate_all(
+                    "els => els.findIndex(el => ((el.closest('label') || el.parentElement)?.innerText || '').toLowerCase().includes('manual'))"
+                )
+                if idx >= 0:
+                    await manual_radio.nth(idx).click(timeout=2000)
             except Exception:
                 pass
             # Click NEXT button for multi-step forms
-            for btn_text in ["NEXT", "Next", "Continue", "Proceed"]:
-                try:
-                    loc = page.locator(f'button:has-text("{btn_text}"), a:has-text("{btn_text}"), input[value="{btn_text}"]').first
-                    if await loc.count() > 0 and await loc.is_visible():
-                        await loc.click(timeout=2000)
-                        await js_wait(page, 1000)
-                        break
-                except Exception:
-                    pass
+            if await click_first_matching(page, ["Next", "Continue", "Proceed"], ["button", "a", "input"]):
+                await wait_for_stable(page, 1000)
 
-            # Check for login/account blocker
-            login_block = await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.detectLoginBlock() : false", False)
-            if login_block:
+            # Check for login/account blocker (also primes the first cycle's captcha check)
+            signals = await detect_blockers(page)
+            if signals["login"]:
                 status = "BLOCKED"
                 detail = "Blocked - External: login_required"
-                png = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.png"
-                try:
-                    await page.screenshot(path=str(png), full_page=True)
-                except Exception:
-                    pass
-                proof = {"screenshot": f"proof/{png.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+                shot = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.jpg"
+                shot_ok = await diag_screenshot(page, shot)
+                proof = {"screenshot": f"proof/{shot.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": shot_ok}
                 return
 
             # ── PHASE 3: Fill, upload, EEO, submit (repeat) ──────────
             for cycle in range(4):
-                # Check for captcha on form page
-                cap_now = await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.detectCaptcha() : false", False)
-                if cap_now:
+                progress_before = (filled_total, eeo_total, uploaded_total)
+                cycle_url = page.url
+                # Check for captcha on form page: cycle 0 reuses the probe above, later
+                # cycles check inside the fill call (nothing is filled when one is up)
+                if cycle == 0 and signals["captcha"]:
+                    first_fill = None
+                else:
+                    first_fill = await apply_profile(page, target_profile, fill_json, guard_captcha=cycle > 0)
+                if first_fill is None:
                     status = "BLOCKED"
                     detail = "Blocked - External: captcha_on_form"
-                    png = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.png"
-                    try:
-                        await page.screenshot(path=str(png), full_page=True)
-                    except Exception:
-                        pass
-                    proof = {"screenshot": f"proof/{png.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+                    shot = PROOF_DIR / f"{slug}_attempt{attempt}_blocked.jpg"
+                    shot_ok = await diag_screenshot(page, shot)
+                    proof = {"screenshot": f"proof/{shot.name}", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": shot_ok}
                     return
 
-                f, e = await apply_profile(page, target_profile)
+                f, e = first_fill
                 filled_total = max(filled_total, f)
                 eeo_total = max(eeo_total, e)
                 uploaded_total = max(uploaded_total, await upload_resume(page, resume_path))
 
-                # Second fill pass after short wait
-                await js_wait(page, 800)
-                f2, e2 = await apply_profile(page, target_profile)
+                # Second fill pass once late fields have rendered; a no-op in-page
+                # when the form didn't change
+                f2, e2 = await apply_profile(page, target_profile, fill_json, settle_ms=800) or (0, 0)
                 filled_total = max(filled_total, f2)
                 eeo_total = max(eeo_total, e2)
 
-                # BambooHR React-specific: use Playwright fill() for controlled inputs
-                if "bamboohr" in page.url:
+                # URL snapshot for the fill stage (fills and dropdowns don't navigate)
+                cur = page.url.lower()
+                on_bamboo = "bamboohr" in cur
+
+                # BambooHR React-specific: native value setter + input/change for controlled inputs
+                if on_bamboo:
                     state_full = expand_state_value(str(target_profile.get("state", "TX")))
                     bamboo_fields = {
                         'input[name="firstName"]': profile.get("first_name", ""),
@@ -1390,9 +2655,9 @@ async def worker(
                         'input[name="state.value"]': state_full,
                         'input[name="city"]': profile.get("city", ""),
                         'input[name="zip"]': profile.get("zip", ""),
-                        'input[name="dateAvailable"]': "03/10/2026",
-                        'input[name="desiredPay"]': "Negotiable",
-                        'input[name="referredBy"]': "Online Job Board",
+                        'input[name="dateAvailable"]': DEFAULT_DATE_AVAILABLE,
+                        'input[name="desiredPay"]': DESIRED_PAY,
+                        'input[name="referredBy"]': REFERRED_BY,
                     }
                     # Also try label-based selectors
                     label_fields = {
@@ -1403,78 +2668,51 @@ async def worker(
                         "Street Address": target_profile.get("address", ""),
                         "City": profile.get("city", ""),
                         "Zip": profile.get("zip", ""),
-                        "Date Available": "03/10/2026",
-                        "Desired Pay": "Negotiable",
-                        "Who Referred You": "Online Job Board",
+                        "Date Available": DEFAULT_DATE_AVAILABLE,
+                        "Desired Pay": DESIRED_PAY,
+                        "Who Referred You": REFERRED_BY,
                     }
-                    pw_filled = 0
-                    for sel, val in bamboo_fields.items():
-                        if not val:
-                            continue
-                        try:
-                            loc = page.locator(sel)
-                            if await loc.count() > 0:
-                                await loc.first.fill(val, timeout=2000)
-                                pw_filled += 1
-                        except Exception:
-                            pass
-                    for sel, option in [
-                        ('select[name="state.value"]', state_full),
-                        ('select[name="stateId"]', state_full),
-                        ('select[name="state"]', state_full),
-                    ]:
-                        try:
-                            loc = page.locator(sel)
-                            if await loc.count() > 0:
-                                await loc.first.select_option(label=option, timeout=2000)
-                                pw_filled += 1
-                        except Exception:
-                            try:
-                                loc = page.locator(sel)
-                                if await loc.count() > 0:
-                                    await loc.first.select_option(value=target_profile.get("state", "TX"), timeout=2000)
-                                    pw_filled += 1
-                            except Exception:
-                                pass
-                    # Label-based fill for fields not matched by name
-                    for lbl, val in label_fields.items():
-                        if not val:
-                            continue
-                        try:
-                            loc = page.get_by_label(lbl)
-                            if await loc.count() > 0:
-                                await loc.first.fill(val, timeout=2000)
-                                pw_filled += 1
-                        except Exception:
-                            pass
+                    state_values = [state_full, str(target_profile.get("state", "TX"))]
+                    pw_filled = await bulk_fill(
+                        page,
+                        list(bamboo_fields.items()) + [
+                            ('select[name="state.value"]', state_values),
+                            ('select[name="stateId"]', state_values),
+                            ('select[name="state"]', state_values),
+                        ],
+                        # Label-based fill for fields not matched by name
+                        label_fields,
+                    )
                     # Textareas
                     textarea_fields = {
                         "career": target_profile.get("career_goals", "Seeking full-time Deckhand/Tankerman role in maritime industry."),
                         "experience": target_profile.get("cover_letter", ""),
                         "environment": target_profile.get("work_environment", "Team-oriented maritime operations environment with safety focus."),
                     }
-                    for keyword, val in textarea_fields.items():
-                        if not val:
-                            continue
-                        try:
-                            textareas = page.locator("textarea")
-                            for i in range(await textareas.count()):
-                                ta = textareas.nth(i)
-                                name = await ta.get_attribute("name") or ""
-                                aria = await ta.get_attribute("aria-label") or ""
-                                ident = (name + " " + aria).lower()
-                                if keyword in ident:
-                                    await ta.fill(val, timeout=2000)
-                                    pw_filled += 1
-                                    break
-                        except Exception:
-                            pass
+                    try:
+                        textareas = locators.locator(page, "textarea")
+                        idents = await textareas.evaluate_all(
+                            "els => els.map(e => ((e.name || '') + ' ' + (e.getAttribute('aria-label') || '')).toLowerCase())"
+                        )
+                        for keyword, val in textarea_fields.items():
+                            if not val:
+                                continue
+                            i = next((i for i, ident in enumerate(idents) if keyword in ident), None)
+                            if i is None:
+                                continue
+                            try:
+                                await textareas.nth(i).fill(val, timeout=2000)
+                                pw_filled += 1
+                            except Exception:
+                                pass
+                    except Exception:
+                        pass
                     if pw_filled > 0:
                         filled_total = max(filled_total, pw_filled)
-                        print(f"  [PW-FILL] BambooHR Playwright fill: {pw_filled} fields", flush=True)
+                        log.info("  [PW-FILL] BambooHR fill: %s fields", pw_filled)
 
                 # BambooHR Fabric UI dropdown handler — sequential to avoid menu overlap
-                if "bamboohr" in page.url:
+                if on_bamboo:
                     native_dropdowns = [
                         ("State", ["Texas", "TX"]),
                         ("Gender", ["Decline to Answer", "Decline to answer", "Decline"]),
@@ -1490,7 +2728,12 @@ async def worker(
                             if label.lower() != "state" and "select" not in btn_text:
                                 continue
                             await btn.click(timeout=3000)
-                            await js_wait(page, 500)
+                            try:
+                                await page.wait_for_selector(
+                                    '.fab-MenuOption, [role="option"], [role="menuitem"]', timeout=1500
+                                )
+                            except Exception:
+                                pass
                             picked = False
                             for option in options:
                                 choice = page.locator(
@@ -1499,12 +2742,12 @@ async def worker(
                                 ).first
                                 if await choice.count() > 0:
                                     await choice.click(timeout=3000)
-                                    await js_wait(page, 300)
+                                    await wait_for_stable(page, 300)
                                     picked = True
                                     break
                             if not picked:
                                 await page.keyboard.press("Escape")
-                                await js_wait(page, 200)
+                                await wait_for_stable(page, 200)
                         except Exception:
                             pass
                     fabric_selects = [
@@ -1515,74 +2758,30 @@ async def worker(
                                         'I do not wish to answer', 'No, I Do Not Have a Disability',
                                         'No', 'None']),
                     ]
-                    for field_name, try_values in fabric_selects:
-                        # Only open if still "--Select--"
-                        opened = await safe_eval(page, f"""() => {{
-                            const toggles = Array.from(document.querySelectorAll('button.fab-SelectToggle, button[data-menu-id]'));
-                            for (const btn of toggles) {{
-                                const label = (btn.getAttribute('aria-label') || btn.innerText || btn.textContent || '').toLowerCase();
-                                if (label.includes('{field_name}')) {{
-                                    btn.scrollIntoView({{block:'center'}});
-                                    btn.click();
-                                    return true;
-                                }}
-                            }}
-                            return false;
-                        }}""", False)
-                        if opened:
-                            await js_wait(page, 1500)
-                            clicked = False
-                            for try_val in try_values:
-                                clicked = await safe_eval(page, f"""() => {{
-                                    const items = Array.from(document.querySelectorAll('.fab-MenuOption, .fab-MenuOption__content, [role="option"], [role="menuitem"]'));
-                                    for (const item of items) {{
-                                        const txt = (item.innerText || item.textContent || '').trim();
-                                        if (txt.toLowerCase() === '{try_val.lower()}' || txt.toLowerCase().includes('{try_val.lower()}')) {{
-                                            item.click();
-                                            return true;
-                                        }}
-                                    }}
-                                    return false;
-                                }}""", False)
-                                if clicked:
-                                    await js_wait(page, 500)
-                                    break
-                            if not clicked:
-                                await page.keyboard.press("Escape")
-                                await js_wait(page, 300)
-                                # Nuclear fallback: set the hidden <select> value directly
-                                await safe_eval(page, f"""() => {{
-                                    const sel = document.querySelector('select[name="{field_name}Id"], select[name="{field_name}"], select[name="{field_name}.value"]');
-                                    if (sel && sel.options) {{
-                                        for (let i = 0; i < sel.options.length; i++) {{
-                                            const txt = sel.options[i].text.toLowerCase();
-                                            if (txt.includes('decline') || txt.includes('no') || txt === 'texas') {{
-                                                sel.value = sel.options[i].value;
-                                                sel.dispatchEvent(new Event('change', {{bubbles: true}}));
-                                                // Also trigger React's nativeInputValueSetter
-                                                const nativeSetter = Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value')?.set;
-                                                if (nativeSetter) {{
-                                                    nativeSetter.call(sel, sel.options[i].value);
-                                                    sel.dispatchEvent(new Event('change', {{bubbles: true}}));
-                                                }}
-                                                return true;
-                                            }}
-                                        }}
-                                    }}
-                                    const inp = document.querySelector('input[name="{field_name}.value"], input[name="{field_name}"]');
-                                    if (inp) {{
-                                        inp.value = '{state_full if field_name == "state" else ""}';
-                                        inp.dispatchEvent(new Event('input', {{bubbles: true}}));
-                                        inp.dispatchEvent(new Event('change', {{bubbles: true}}));
-                                        return true;
-                                    }}
-                                    return false;
-                                }}""", False)
-
-                await js_wait(page, 300)
+                    pending = [
+                        {"field": field_name, "values": try_values,
+                         "fallback": state_full if field_name == "state" else ""}
+                        for field_name, try_values in fabric_selects
+                    ]
+                    # One round trip for every field; re-entered only after a trusted Escape
+                    while pending:
+                        picked = await safe_eval(
+                            page,
+                            "(f) => window.__SWM2__ ? window.__SWM2__.selectFabricAll(f) : []",
+                            [],
+                            arg=pending,
+                        )
+                        if not isinstance(picked, list) or not picked:
+                            break
+                        if picked[-1] not in ("none", "clicked"):
+                            # Trusted Escape in case the menu ignores the synthetic one
+                            await page.keyboard.press("Escape")
+                        pending = pending[len(picked):]
+
+                await wait_for_stable(page, 300)
 
                 # ADP Workforce Now: fill registration & application forms
-                if "adp.com" in page.url:
+                if "adp.com" in cur:
                     adp_fields = {
                         'input[name="guestFirstName"]': profile.get("first_name", ""),
                         'input[name="guestLastName"]': profile.get("last_name", ""),
@@ -1599,123 +2798,57 @@ async def worker(
                         "City": profile.get("city", ""),
                         "Zip": profile.get("zip", ""),
                     }
-                    adp_filled = 0
-                    for sel, val in adp_fields.items():
-                        if not val:
-                            continue
-                        try:
-                            loc = page.locator(sel)
-                            if await loc.count() > 0:
-                                await loc.first.fill(val, timeout=2000)
-                                adp_filled += 1
-                        except Exception:
-                            pass
-                    for lbl, val in adp_label_fields.items():
-                        if not val:
-                            continue
-                        try:
-                            loc = page.get_by_label(lbl)
-                            if await loc.count() > 0:
-                                await loc.first.fill(val, timeout=2000)
-                                adp_filled += 1
-                        except Exception:
-                            pass
+                    adp_filled = await bulk_fill(page, adp_fields, adp_label_fields)
                     if adp_filled > 0:
                         filled_total = max(filled_total, adp_filled)
-                        print(f"  [PW-FILL] ADP fill: {adp_filled} fields", flush=True)
+                        log.info("  [PW-FILL] ADP fill: %s fields", adp_filled)
                     # Click Continue/Submit on ADP
                     for btn_id in ["recruitment_login_recaptcha", "recruitment_login_submit"]:
                         try:
-                            btn = page.locator(f'#{btn_id}')
+                            btn = locators.locator(page, f'#{btn_id}')
                             if await btn.count() > 0 and await btn.is_visible():
                                 await btn.click(timeout=5000)
-                                await js_wait(page, 3000)
+                                await wait_for_stable(page, 3000)
                                 await reinject(page)
                                 break
                         except Exception:
                             pass
 
-                # Multi-step form: advance to next page after filling
+                # Multi-step form: advance to next page after filling (ADP may have navigated)
                 cur = page.url.lower()
                 if "ourcareerpages" in cur or "entertimeonline" in cur:
                     # Click Continue/Next/Save & Continue on multi-step forms
-                    for step_text in ["Continue", "NEXT", "Next", "Save & Continue",
-                                       "Save and Continue", "NEXT: CONTACT INFO",
-                                       "Submit Application", "Submit"]:
-                        try:
-                            loc = page.locator(f'button:has-text("{step_text}"), a:has-text("{step_text}"), input[type="submit"][value*="{step_text}"]').first
-                            if await loc.count() > 0 and await loc.is_visible():
-                                await loc.click(timeout=3000)
-                                await js_wait(page, 2000)
-                                await reinject(page)
-                                break
-                        except Exception:
-                            pass
+                    step = await click_first_matching(
+                        page,
+                        ["Continue", "Next", "Save & Continue", "Save and Continue",
+                         "Submit Application", "Submit"],
+                        ["button", "a", "input[type='submit']"],
+                    )
+                    if step:
+                        await wait_for_stable(page, 2000)
+                        await reinject(page)
                     # Dismiss error dialogs that appear after form actions
-                    for dismiss_text in ["OK", "Close", "Dismiss"]:
-                        try:
-                            d = page.locator(f'button:has-text("{dismiss_text}")').first
-                            if await d.count() > 0 and await d.is_visible():
-                                await d.click(timeout=1000)
-                                await js_wait(page, 500)
-                        except Exception:
-                            pass
+                    await dismiss_dialogs(page)
 
-                # Clear any honeypot fields (anti-bot traps)
-                await safe_eval(page, """() => {
-                    document.querySelectorAll('[aria-hidden="true"] input, input[tabindex="-1"]').forEach(inp => {
-                        if (inp.value) {
-                            const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value')?.set;
-                            if (setter) setter.call(inp, '');
-                            else inp.value = '';
-                            inp.dispatchEvent(new Event('input', {bubbles: true}));
-                            inp.dispatchEvent(new Event('change', {bubbles: true}));
-                        }
-                    });
-                }""", None)
-
-                # React state diagnostic: check what React thinks each field contains
-                if "bamboohr" in page.url:
-                    react_diag = await safe_eval(page, """() => {
-                        const form = document.getElementById('job-application-form') || document.querySelector('form');
-                        if (!form) return {error: 'no_form'};
-                        const inputs = Array.from(form.querySelectorAll('input, textarea, select'));
-                        const state = {};
-                        const empty = [];
-                        const required = [];
-                        for (const inp of inputs) {
-                            const name = inp.name || inp.id || inp.getAttribute('aria-label') || inp.type;
-                            const val = inp.value || '';
-                            state[name] = val.substring(0, 30);
-                            if (!val && inp.type !== 'hidden' && inp.type !== 'file') {
-                                empty.push(name);
-                            }
-                            if (inp.required || inp.getAttribute('aria-required') === 'true') {
-                                required.push(name + '=' + (val ? 'OK' : 'EMPTY'));
-                            }
-                        }
-                        // Also check React fiber for validation state
-                        const submitBtn = form.querySelector('button[type="submit"]');
-                        const btnDisabled = submitBtn ? submitBtn.disabled : 'no_btn';
-                        return {
-                            total: inputs.length,
-                            empty_count: empty.length,
-                            empty: empty.slice(0, 10),
-                            required: required.slice(0, 15),
-                            btn_disabled: btnDisabled
-                        };
-                    }""", {"error": "eval_failed"})
-                    print(f"  [REACT-DIAG] {react_diag}", flush=True)
+                # Honeypot fields (anti-bot traps) are emptied in-page by the helper's janitor
+
+                # React state diagnostic: check what React thinks each field contains.
+                # One host check gates both BambooHR-only payloads around the submit.
+                is_bamboo = "bamboohr" in page.url.lower()
+                if is_bamboo:
+                    pre = await safe_eval(page, PRESUBMIT_JS, None) or {"react_diag": {"error": "eval_failed"}}
+                    log.info("  [REACT-DIAG] %s recorder=%s", pre["react_diag"], pre.get("install_ok"))
 
                 # Submit — capture network + console for debugging
                 before_url = page.url
-                submit_responses: list[dict] = []
-                console_msgs: list[str] = []
+                # Bounded: chatty pages can emit hundreds of these in the submit window
+                submit_responses: deque[dict] = deque(maxlen=16)
+                console_msgs: deque[str] = deque(maxlen=5)
 
                 def _on_resp(resp):
+                    # Only form writes count; on BambooHR every asset URL contains the host
                     method = resp.request.method
-                    u = resp.url.lower()
-                    if method in ("POST", "PUT", "PATCH") or "api" in u or "bamboohr" in u:
+                    if method in SUBMIT_METHODS:
                         submit_responses.append({"url": resp.url[:120], "status": resp.status, "method": method})
 
                 def _on_console(msg):
@@ -1724,82 +2857,60 @@ async def worker(
 
                 page.on("response", _on_resp)
                 page.on("console", _on_console)
+                submit_found = False
 
-                try:
-                    # Monkey-patch fetch to log outgoing requests
-                    if "bamboohr" in page.url:
-                        await safe_eval(page, """() => {
-                            if (!window.__submitLog) {
-                                window.__submitLog = [];
-                                const origFetch = window.fetch;
-                                window.fetch = function(...args) {
-                                    window.__submitLog.push({type: 'fetch', url: String(args[0]).substring(0, 100), method: args[1]?.method || 'GET'});
-                                    return origFetch.apply(this, args);
-                                };
-                                const origXhrOpen = XMLHttpRequest.prototype.open;
-                                XMLHttpRequest.prototype.open = function(method, url) {
-                                    window.__submitLog.push({type: 'xhr', url: String(url).substring(0, 100), method: method});
-                                    return origXhrOpen.apply(this, arguments);
-                                };
-                            }
-                        }""", None)
-
-                    # Tier 1: Playwright native click (most reliable for React)
-                    try:
-                        submit_btn = page.locator('button[type="submit"]')
-                        if await submit_btn.count() > 0:
-                            await submit_btn.first.scroll_into_view_if_needed(timeout=2000)
-                            await submit_btn.first.click(timeout=5000, force=True)
-                    except Exception as e:
-                        print(f"  [SUBMIT-T1] Click error: {e}", flush=True)
+                async def wait_submit() -> None:
+                    # Move on at the first form write instead of sleeping out each tier
+                    if not submit_responses:
+                        await wait_for_submit_response(page, 3000)
 
-                    await js_wait(page, 3000)
+                try:
+                    # Tier 1: scroll + native click on the submit button in one evaluate
+                    t1 = await safe_eval(page, SUBMIT_CLICK_JS, None) or {"found": False, "error": "eval_error"}
+                    submit_found = bool(t1.get("found"))
+                    if t1.get("error"):
+                        log.info("  [SUBMIT-T1] Click error: %s", t1["error"])
+                    if t1.get("disabled"):
+                        # Nothing was clicked; go straight to Tier 2
+                        log.info("  [SUBMIT-T1] submit button disabled: %r", t1.get("text", ""))
+                    elif t1.get("found"):
+                        await wait_submit()
 
                     # Tier 2: form.requestSubmit() with error capture
-                    has_file_inputs = await form_has_file_inputs(page)
-                    if not submit_responses and not should_skip_request_submit(page.url, has_file_inputs):
-                        submit_err = await safe_eval(page, """() => {
-                            const form = document.getElementById('job-application-form') || document.querySelector('form');
-                            if (!form) return 'no_form_found';
-                            try { form.requestSubmit(); return 'requestSubmit_ok'; }
-                            catch(e) { return 'requestSubmit_err: ' + e.message; }
-                        }""", "eval_error")
-                        print(f"  [SUBMIT-T2] requestSubmit result: {submit_err}", flush=True)
-                        await js_wait(page, 3000)
-                    elif not submit_responses:
-                        print("  [SUBMIT-T2] skipped requestSubmit for upload-heavy or non-form page", flush=True)
+                    if not submit_responses:
+                        has_file_inputs = await form_has_file_inputs(page)
+                        if not should_skip_request_submit(page.url, has_file_inputs):
+                            submit_err = await safe_eval(page, REQUEST_SUBMIT_JS, "eval_error")
+                            log.info("  [SUBMIT-T2] requestSubmit result: %s", submit_err)
+                            await wait_submit()
+                        else:
+                            log.info("  [SUBMIT-T2] skipped requestSubmit for upload-heavy or non-form page")
 
                     # Tier 3: JS click with full event sequence
                     if not submit_responses:
-                        await click_hints(page, extra_submit)
-                        await js_wait(page, 3000)
+                        if await click_hints(page, extra_submit):
+                            submit_found = True
+                        await wait_submit()
+                    submit_found = submit_found or bool(submit_responses)
 
-                    # Wait for AJAX response
-                    await js_wait(page, 3000)
+                    # Let the confirmation (or validation errors) render
+                    await wait_for_stable(page, 1500 if submit_responses else 3000)
 
                     # Log diagnostics
                     if submit_responses:
                         for sr in submit_responses:
-                            print(f"  [SUBMIT-NET] {sr.get('method','?')} {sr['status']} {sr['url']}", flush=True)
+                            log.info("  [SUBMIT-NET] %s %s %s", sr.get("method", "?"), sr["status"], sr["url"])
                     else:
-                        print(f"  [SUBMIT-NET] No POST requests detected — form may not have submitted", flush=True)
-                    for cm in console_msgs[:5]:
-                        print(f"  [CONSOLE] {cm}", flush=True)
+                        log.info("  [SUBMIT-NET] No POST requests detected — form may not have submitted")
+                    for cm in console_msgs:
+                        log.debug("  [CONSOLE] %s", cm)
                     # Check fetch/XHR monkey-patch log
-                    if "bamboohr" in page.url:
-                        fetch_log = await safe_eval(page, "() => JSON.stringify(window.__submitLog || [])", "[]")
-                        print(f"  [FETCH-LOG] {fetch_log}", flush=True)
+                    if is_bamboo:
                         # Also check for visible validation errors after submit attempt
-                        vis_errors = await safe_eval(page, """() => {
-                            const errs = [];
-                            document.querySelectorAll('[class*="error"], [class*="Error"], [role="alert"]').forEach(el => {
-                                const txt = (el.innerText || '').trim();
-                                if (txt && txt.length < 200) errs.push(txt);
-                            });
-                            return errs.slice(0, 10);
-                        }""", [])
-                        if vis_errors:
-                            print(f"  [VIS-ERRORS] {vis_errors}", flush=True)
+                        post = await safe_eval(page, POSTSUBMIT_JS, None) or {"fetch_log": [], "vis_errors": []}
+                        log.info("  [FETCH-LOG] %s", post["fetch_log"])
+                        if post["vis_errors"]:
+                            log.info("  [VIS-ERRORS] %s", post["vis_errors"])
 
                 finally:
                     page.remove_listener("response", _on_resp)
@@ -1813,7 +2924,7 @@ async def worker(
                 await reinject(page)
 
                 # Check for strict confirmation after submit
-                success = await check_strict_success(page, slug, attempt, extra_markers)
+                success = await check_strict_success(page, slug, attempt, success_markers)
                 if success["ok"]:
                     proof = success["proof"]
                     proof["filled_count"] = filled_total
@@ -1824,27 +2935,36 @@ async def worker(
                     return
 
                 # No confirmation yet — try clicking apply again (multi-page forms)
-                await click_hints(page, extra_apply)
-                await js_wait(page, 500)
+                next_hit = await click_hints(page, extra_apply)
+                await wait_for_stable(page, 500)
                 await reinject(page)
 
+                # Converged: same page, nothing new filled, nothing to submit or advance.
+                # Two cycles minimum so late-rendered multi-step forms still get a pass.
+                if (
+                    cycle >= 1
+                    and not (submit_found or next_hit)
+                    and page.url == cycle_url
+                    and (filled_total, eeo_total, uploaded_total) == progress_before
+                ):
+                    log.info("  [CYCLE] no progress after cycle %d; stopping early", cycle + 1)
+                    break
+
             # ── PHASE 4: Final check ──────────────────────────────────
-            success = await check_strict_success(page, slug, attempt, extra_markers)
+            success = await check_strict_success(page, slug, attempt, success_markers)
             proof = success["proof"]
             proof["filled_count"] = filled_total
             proof["eeo_actions"] = eeo_total
             proof["resume_uploads"] = uploaded_total
 
-            # Capture diagnostic source for ALL attempts (not just high-fill)
-            if True:
-                diag_src = str(await safe_eval(page, "() => window.__SWM2__ ? window.__SWM2__.getPageSource() : ''", "") or "")
+            # Diagnostic source for every failed attempt; a verified success already
+            # saved its forensic snapshot in check_strict_success
+            if not success["ok"]:
+                diag_src = await page_source_head(page, DIAG_HTML_LIMIT)
                 if diag_src:
-                    dp = SOURCE_DIR / f"{slug}_attempt{attempt}_diag.html"
-                    dp.parent.mkdir(parents=True, exist_ok=True)
-                    try:
-                        dp.write_text(diag_src[:500_000], encoding="utf-8")
-                    except Exception:
-                        pass
+                    queue_write(
+                        SOURCE_DIR / f"{slug}_attempt{attempt}_diag.html", diag_src.encode("utf-8", "ignore")
+                    )
 
             if success["ok"]:
                 status = "COMPLETE"
@@ -1853,55 +2973,44 @@ async def worker(
                 status = "INCOMPLETE"
                 detail = "no_strict_confirmation"
 
+        async def salvage(ok_detail: str, fail_detail: str) -> tuple[str, str, dict[str, Any]]:
+            """After an aborted flow: did we land on a confirmation page anyway?"""
+            await reinject(page)
+            success = await check_strict_success(page, slug, attempt, success_markers)
+            if success["ok"]:
+                return "COMPLETE", ok_detail, success["proof"]
+            shot = PROOF_DIR / f"{slug}_attempt{attempt}_incomplete.jpg"
+            shot_ok = heal_count > DIAG_SCREENSHOT_MIN_HEALS and await diag_screenshot(page, shot)
+            return "INCOMPLETE", fail_detail, {
+                "screenshot": f"proof/{shot.name}" if shot_ok else "", "final_url": page.url,
+                "text_hits": [], "url_match": False, "screenshot_ok": shot_ok,
+            }
+
         # ── Execute flow with TTL timeout ─────────────────────────────
         try:
             await asyncio.wait_for(flow(), timeout=TTL_SECONDS)
-        except (asyncio.TimeoutError, PlaywrightTimeoutError) as exc:
-            # Timeout — check if we ended on a confirmation page
-            await reinject(page)
-            success = await check_strict_success(page, slug, attempt, extra_markers)
-            if success["ok"]:
-                status = "COMPLETE"
-                detail = f"timeout_with_strict_confirmation"
-                proof = success["proof"]
-            else:
-                status = "INCOMPLETE"
-                detail = f"timeout_{TTL_SECONDS}s_no_confirmation"
-                png = PROOF_DIR / f"{slug}_attempt{attempt}_incomplete.png"
-                try:
-                    await page.screenshot(path=str(png), full_page=True)
-                except Exception:
-                    pass
-                proof = {"screenshot": f"proof/{png.name}" if png.exists() else "", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+        except (asyncio.TimeoutError, PlaywrightTimeoutError):
+            status, detail, proof = await salvage(
+                "timeout_with_strict_confirmation", f"timeout_{TTL_SECONDS}s_no_confirmation"
+            )
         except Exception as exc:
             # Context destroyed = likely navigation (possibly to confirmation page!)
             error_msg = str(exc)
             navigated = "context was destroyed" in error_msg.lower() or "navigation" in error_msg.lower()
             if navigated:
+                # Headers first, then stop as soon as confirmation text has streamed in
+                # (no need to sit out DOMContentLoaded on a slow thank-you page)
                 try:
-                    await page.wait_for_load_state("domcontentloaded", timeout=8000)
-                except Exception:
-                    pass
-            await reinject(page)
-            success = await check_strict_success(page, slug, attempt, extra_markers)
-            if success["ok"]:
-                status = "COMPLETE"
-                detail = f"post_navigation_strict_confirmation"
-                proof = success["proof"]
-            else:
-                status = "INCOMPLETE"
-                detail = f"exception:{exc.__class__.__name__}:{str(exc)[:120]}"
-                png = PROOF_DIR / f"{slug}_attempt{attempt}_incomplete.png"
-                try:
-                    await page.screenshot(path=str(png), full_page=True)
+                    await page.wait_for_load_state("commit", timeout=3000)
                 except Exception:
                     pass
-                proof = {"screenshot": f"proof/{png.name}" if png.exists() else "", "final_url": page.url, "text_hits": [], "url_match": False, "screenshot_ok": png.exists()}
+                await wait_until(page, CONFIRMATION_READY_JS, 5000)
+            status, detail, proof = await salvage(
+                "post_navigation_strict_confirmation", f"exception:{exc.__class__.__name__}:{error_msg[:120]}"
+            )
         finally:
-            try:
-                await context.close()
-            except Exception:
-                pass
+            locators.detach()
+            context.remove_listener("page", on_popup)
 
         proof.setdefault("filled_count", filled_total)
         proof.setdefault("eeo_actions", eeo_total)
@@ -1922,44 +3031,82 @@ async def worker(
 # Swarm runner
 # ---------------------------------------------------------------------------
 async def run_swarm(attempt: int, batch_size: int, headful: bool) -> dict[str, Any]:
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    PROOF_DIR.mkdir(parents=True, exist_ok=True)
-    SOURCE_DIR.mkdir(parents=True, exist_ok=True)
-    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    global _PREFERRED_BROWSER
+    for d in (LOG_DIR, PROOF_DIR, SOURCE_DIR, STATE_PATH.parent):
+        ensure_dir(d)
 
     profile = load_profile()
     state = load_state()
-    sem = asyncio.Semaphore(max(1, min(batch_size, MAX_BATCH)))
+    site_times: dict[str, float] = read_json(SITE_TIMES_PATH, {})
+    n_workers = max(1, min(batch_size, MAX_BATCH))
+
+    # Longest-first queue drained by a fixed set of consumers: slow hosts start early
+    # instead of stretching the tail, and an idle consumer takes the next job at once
+    queue: asyncio.Queue[tuple[int, dict[str, str]]] = asyncio.Queue()
+    for item in schedule_longest_first(TARGETS, site_times):
+        queue.put_nowait(item)
+    slots: list[dict[str, Any] | None] = [None] * len(TARGETS)
+    # One line per finished target, so a crashed run still leaves its results behind
+    journal = LOG_DIR / f"swarm_attempt_{attempt}_results.jsonl"
+    journal.unlink(missing_ok=True)
+
+    # Imported here so --self-heal and plain imports never load the driver
+    from playwright.async_api import async_playwright
+
+    async with disk_flusher(), async_playwright() as p:
+        cached_browser = read_json(BROWSER_PREF_PATH, {}).get("browser")
+        _PREFERRED_BROWSER = _PREFERRED_BROWSER or cached_browser
+        pool = await BrowserPool(p, headful, size=min(batch_size, BROWSER_POOL_SIZE)).start()
+        if _PREFERRED_BROWSER != cached_browser:
+            queue_write(BROWSER_PREF_PATH, json.dumps({"browser": _PREFERRED_BROWSER}).encode("utf-8"))
+        admission = Admission(n_workers)
+        loop = asyncio.get_running_loop()
+
+        async def consume() -> None:
+            while not queue.empty():
+                idx, target = queue.get_nowait()
+                started = None
+                try:
+                    async with admission.slot():
+                        # Timed from inside the slot: queueing for admission says nothing
+                        # about the host, and would inflate its EMA for the next run
+                        started = loop.time()
+                        # flow() is capped at TTL_SECONDS inside worker; this also bounds
+                        # the lease and the wrap-up so one hung page can't pin a consumer
+                        res = await asyncio.wait_for(
+                            worker(pool, target, profile, state, attempt), TTL_SECONDS + WORKER_GRACE_SECONDS
+                        )
+                except Exception as exc:
+                    res = {
+                        "company": target["company"],
+                        "url": target["url"],
+                        "status": "INCOMPLETE",
+                        "detail": f"worker_crash:{exc.__class__.__name__}:{str(exc)[:120]}",
+                        "last_attempt": attempt,
+                        "proof": {},
+                        "updated_at": utc_now(),
+                    }
+                elapsed = loop.time() - started if started is not None else 0.0
+                await admission.feedback(res)
+                if started is not None:
+                    record_site_time(site_times, target["url"], elapsed)
+                slots[idx] = res
+                queue_write(journal, (json.dumps(res) + "\n").encode("utf-8"))
+                # Report each target as it lands rather than after the slowest one
+                log.info("[%s] %s (%.0fs, %d queued)", res["status"], target["company"], elapsed, queue.qsize())
 
-    async with async_playwright() as p:
-        browser = None
-        for bt in [p.chromium, p.firefox]:
-            try:
-                browser = await bt.launch(
-                    headless=not headful,
-                    args=["--no-sandbox", "--disable-setuid-sandbox"] if bt == p.chromium else [],
-                )
-                break
-            except Exception:
-                continue
-        if not browser:
-            raise RuntimeError("Failed to launch any browser")
-
-        # Process in strict batches of 3
-        results: list[dict[str, Any]] = []
-        for i in range(0, len(TARGETS), batch_size):
-            batch = TARGETS[i : i + batch_size]
-            tasks = [asyncio.create_task(worker(browser, sem, t, profile, state, attempt)) for t in batch]
-            batch_results = await asyncio.gather(*tasks)
-            results.extend(batch_results)
-        await browser.close()
+        await asyncio.gather(*(consume() for _ in range(n_workers)))
+        await pool.close()
+
+    results: list[dict[str, Any]] = [r for r in slots if r is not None]
+    write_json(SITE_TIMES_PATH, site_times)
 
     complete = sum(1 for r in results if r.get("status") == "COMPLETE")
     blocked = sum(1 for r in results if r.get("status") == "BLOCKED")
     payload = {
         "generated_at": utc_now(),
         "attempt": attempt,
-        "batch_size": max(1, min(batch_size, MAX_BATCH)),
+        "batch_size": n_workers,
         "ttl_seconds": TTL_SECONDS,
         "max_self_heal_attempts": MAX_SELF_HEAL_ATTEMPTS,
         "results": results,
@@ -1974,12 +3121,26 @@ async def run_swarm(attempt: int, batch_size: int, headful: bool) -> dict[str, A
     return payload
 
 
+def start_logging(verbose: bool) -> QueueListener:
+    """Route the swarm logger through a queue so workers never block on stderr writes."""
+    q: queue.Queue[logging.LogRecord] = queue.Queue(-1)
+    sink = logging.StreamHandler(sys.stderr)
+    sink.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(q, sink)
+    log.handlers[:] = [QueueHandler(q)]
+    log.setLevel(logging.DEBUG if verbose else logging.INFO)
+    log.propagate = False
+    listener.start()
+    return listener
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Maritime L5 swarm runner v2")
     parser.add_argument("--attempt", type=int, default=1)
     parser.add_argument("--batch-size", type=int, default=3)
     parser.add_argument("--headful", action="store_true")
     parser.add_argument("--self-heal", action="store_true")
+    parser.add_argument("-v", "--verbose", action="store_true", help="also log browser console lines from the submit window")
     return parser.parse_args()
 
 
@@ -1990,13 +3151,17 @@ def main() -> None:
         print(json.dumps({"self_heal": True, "state": state}, indent=2))
         return
 
-    payload = asyncio.run(
-        run_swarm(
-            max(1, int(args.attempt)),
-            max(1, min(int(args.batch_size), MAX_BATCH)),
-            bool(args.headful),
+    listener = start_logging(bool(args.verbose))
+    try:
+        payload = asyncio.run(
+            run_swarm(
+                max(1, int(args.attempt)),
+                max(1, min(int(args.batch_size), MAX_BATCH)),
+                bool(args.headful),
+            )
         )
-    )
+    finally:
+        listener.stop()
     print(json.dumps(payload["summary"], indent=2))
 
 
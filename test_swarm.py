@@ -1,6 +1,14 @@
+import asyncio
+import fnmatch
+import gzip
+import json
+import shutil
+import subprocess
+import tempfile
 import unittest
 import sys
 import types
+from pathlib import Path
 
 playwright_module = types.ModuleType("playwright")
 playwright_async_api = types.ModuleType("playwright.async_api")
@@ -71,5 +79,463 @@ class SwarmTailoringTests(unittest.TestCase):
         )
 
 
+class MarkerScannerTests(unittest.TestCase):
+    def test_marker_scanner_reports_overlapping_markers_with_offsets(self) -> None:
+        text = "header. your application was submitted successfully! thanks for applying"
+        scan = swarm.compile_marker_scanner(tuple(swarm.STRICT_TEXT_MARKERS) + ("your application",))
+
+        offsets = scan(text)
+
+        self.assertEqual(offsets["your application was submitted"], text.index("your application"))
+        self.assertEqual(offsets["your application"], text.index("your application"))
+        self.assertEqual(
+            offsets["application was submitted successfully"], text.index("application was submitted")
+        )
+        self.assertEqual(offsets["thanks for applying"], text.index("thanks for applying"))
+        self.assertNotIn("thank you for applying", offsets)
+
+
+class StateHintsTests(unittest.TestCase):
+    def test_state_hints_merge_learned_hints_once_per_state(self) -> None:
+        state = {"extra_success_markers": ["Offer Pending"], "extra_submit_hints": ["Send It"]}
+
+        markers, apply, submit = swarm.state_hints(state)
+
+        self.assertEqual(markers[: len(swarm.STRICT_TEXT_MARKERS)], swarm.STRICT_TEXT_MARKERS)
+        self.assertEqual(markers[-1], "offer pending")
+        self.assertEqual(apply, swarm.APPLY_HINTS)
+        self.assertEqual(submit[-1], "send it")
+        self.assertIs(swarm.state_hints(dict(state)), swarm.state_hints(state))
+
+
+class BlockedUrlTests(unittest.TestCase):
+    def test_blocked_url_pattern_matches_assets_and_trackers_only(self) -> None:
+        blocked = swarm.BLOCKED_URL_RE.search
+
+        self.assertTrue(blocked("https://cdn.example.com/logo.png"))
+        self.assertTrue(blocked("https://cdn.example.com/font.woff2?v=3"))
+        self.assertTrue(blocked("https://www.googletagmanager.com/gtm.js"))
+        self.assertFalse(blocked("https://cdn.example.com/app.css"))
+        self.assertFalse(blocked("https://jobs.example.com/apply.png-form/start"))
+        self.assertTrue(blocked("https://CDN.example.com/LOGO.PNG"))
+        self.assertTrue(blocked("https://cdn.segment.com/analytics.js"))
+        self.assertTrue(blocked("https://connect.facebook.net/en_US/fbevents.js"))
+        self.assertFalse(blocked("https://jobs.example.com/segment/apply"))
+        self.assertFalse(blocked("https://jobs.example.com/apply?ref=hotjar"))
+
+    def test_cdp_globs_and_route_regex_block_the_same_urls(self) -> None:
+        # CDP globs: "*" is the only wildcard, "?" is literal
+        def cdp_blocked(url: str) -> bool:
+            return any(fnmatch.fnmatchcase(url, p.replace("?", "[?]")) for p in swarm.BLOCKED_URL_PATTERNS)
+
+        cases = {
+            "https://cdn.example.com/logo.png": True,
+            "https://cdn.example.com/LOGO.PNG": True,
+            "https://cdn.example.com/font.woff2?v=3": True,
+            "https://cdn.example.com/app.css": False,
+            "https://jobs.example.com/apply.png-form/start": False,
+            "https://www.google-analytics.com/analytics.js": True,
+            "https://googletagmanager.com/gtm.js": True,
+            "https://connect.facebook.net/en_US/fbevents.js": True,
+            "https://static.hotjar.com:443/c/hotjar.js": True,
+            "https://jobs.example.com/segment/apply": False,
+            "https://jobs.example.com/apply?ref=facebook.net": False,
+            "https://segmentation.example.com/jobs": False,
+        }
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(cdp_blocked(url), expected)
+                self.assertEqual(bool(swarm.BLOCKED_URL_RE.search(url)), expected)
+
+
+class ScheduleTests(unittest.TestCase):
+    def test_schedule_puts_slow_and_unseen_hosts_first(self) -> None:
+        targets = [
+            {"company": "Fast", "url": "https://fast.example.com/jobs"},
+            {"company": "New", "url": "https://new.example.com/jobs"},
+            {"company": "Slow", "url": "https://slow.example.com/careers"},
+        ]
+        times = {"fast.example.com": 10.0, "slow.example.com": 90.0}
+
+        order = [i for i, _ in swarm.schedule_longest_first(targets, times)]
+
+        self.assertEqual(order, [1, 2, 0])
+        swarm.record_site_time(times, "https://fast.example.com/other", 20.0)
+        self.assertAlmostEqual(times["fast.example.com"], 13.0)
+        swarm.record_site_time(times, "https://new.example.com/jobs", 50.0)
+        self.assertEqual(times["new.example.com"], 50.0)
+
+
+class FileWriteTests(unittest.TestCase):
+    def test_write_json_replaces_atomically(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "state" / "runtime.json"
+            swarm.write_json(path, {"a": 1})
+            swarm.write_json(path, {"a": 2})
+
+            self.assertEqual(swarm.read_json(path, {}), {"a": 2})
+            self.assertEqual([p.name for p in path.parent.iterdir()], ["runtime.json"])
+
+    def test_jsonl_writes_append(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = Path(tmp) / "results.jsonl"
+            swarm._write_batch([(journal, b'{"a": 1}\n'), (journal, b'{"a": 2}\n')])
+            swarm._write_batch([(journal, b'{"a": 3}\n')])
+
+            self.assertEqual(journal.read_text().splitlines(), ['{"a": 1}', '{"a": 2}', '{"a": 3}'])
+
+
+class LogScanTests(unittest.TestCase):
+    def test_log_scan_finds_needle_split_across_chunks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "swarm.log"
+            log.write_bytes(b"x" * 10 + b"NO_STRICT" + b"y" * 10)
+
+            self.assertTrue(swarm._log_has_any(log, (b"incomplete", b"no_strict"), chunk_size=13))
+            self.assertFalse(swarm._log_has_any(log, (b"incomplete",), chunk_size=13))
+            self.assertFalse(swarm._log_has_any(Path(tmp) / "missing.log", (b"incomplete",)))
+
+            with log.open("ab") as f:
+                f.write(b"status=incomplete\n")
+            self.assertTrue(swarm._log_has_any(log, (b"incomplete",), chunk_size=13))
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages: list[FakeContextPage] = []
+        self.cookie_clears = 0
+        self.permission_clears = 0
+        self.closed = False
+        self.handlers: dict[str, object] = {}
+
+    def on(self, event: str, handler: object) -> None:
+        self.handlers[event] = handler
+
+    async def add_init_script(self, script: str) -> None:
+        self.script = script
+
+    async def route(self, pattern: object, handler: object) -> None:
+        self.routed = pattern
+
+    async def new_page(self) -> "FakeContextPage":
+        page = FakeContextPage(self)
+        self.pages.append(page)
+        self.handlers["page"](page)
+        return page
+
+    async def new_cdp_session(self, page: object) -> object:
+        raise RuntimeError("no cdp")
+
+    async def clear_cookies(self) -> None:
+        self.cookie_clears += 1
+
+    async def clear_permissions(self) -> None:
+        self.permission_clears += 1
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeContextPage:
+    def __init__(self, context: FakeContext) -> None:
+        self.context = context
+        self.url = ""
+        self.closed = False
+        self.storage_clears = 0
+        self.handlers: dict[str, object] = {}
+
+    def on(self, event: str, handler: object) -> None:
+        self.handlers[event] = handler
+
+    async def goto(self, url: str, **_: object) -> None:
+        self.url = url
+        self.handlers["framenavigated"](types.SimpleNamespace(url=url))
+
+    async def evaluate(self, script: str) -> None:
+        self.storage_clears += 1
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def close(self) -> None:
+        self.closed = True
+        self.context.pages.remove(self)
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.closed = False
+        self.contexts: list[FakeContext] = []
+
+    async def new_context(self, **_: object) -> FakeContext:
+        context = FakeContext()
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowserType:
+    def __init__(self) -> None:
+        self.launched: list[FakeBrowser] = []
+
+    async def launch(self, **_: object) -> FakeBrowser:
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class BrowserPoolTests(unittest.TestCase):
+    def test_checkout_recycles_browser_after_limit(self) -> None:
+        chromium = FakeBrowserType()
+        p = types.SimpleNamespace(chromium=chromium, firefox=FakeBrowserType())
+
+        async def scenario() -> list[FakeBrowser]:
+            pool = await swarm.BrowserPool(p, headful=False, size=1, recycle_after=2).start()
+            seen = []
+            for _ in range(3):
+                async with pool.checkout() as browser:
+                    seen.append(browser)
+            await pool.close()
+            await asyncio.sleep(0.01)  # spare Firefox launches close in the background
+            return seen
+
+        seen = asyncio.run(scenario())
+
+        self.assertIs(seen[0], seen[1])
+        self.assertIsNot(seen[1], seen[2])
+        self.assertTrue(seen[0].closed)
+        self.assertEqual(len(chromium.launched), 2)
+        self.assertTrue(chromium.launched[1].closed)
+        self.assertTrue(all(spare.closed for spare in p.firefox.launched))
+
+    def test_cached_browser_preference_skips_the_race(self) -> None:
+        p = types.SimpleNamespace(chromium=FakeBrowserType(), firefox=FakeBrowserType())
+        saved = swarm._PREFERRED_BROWSER
+        swarm._PREFERRED_BROWSER = "firefox"
+        try:
+            browser = asyncio.run(swarm.launch_browser(p, headful=False))
+        finally:
+            swarm._PREFERRED_BROWSER = saved
+
+        self.assertIs(browser, p.firefox.launched[0])
+        self.assertEqual(p.chromium.launched, [])
+
+    def test_cold_pool_start_races_a_single_firefox_spare(self) -> None:
+        p = types.SimpleNamespace(chromium=FakeBrowserType(), firefox=FakeBrowserType())
+        saved = swarm._PREFERRED_BROWSER
+        swarm._PREFERRED_BROWSER = None
+
+        async def scenario() -> None:
+            pool = await swarm.BrowserPool(p, headful=False, size=3).start()
+            await pool.close()
+            await asyncio.sleep(0.01)  # the spare closes in the background
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            swarm._PREFERRED_BROWSER = saved
+
+        self.assertEqual(len(p.chromium.launched), 3)
+        self.assertEqual(len(p.firefox.launched), 1)
+        self.assertTrue(p.firefox.launched[0].closed)
+        self.assertIsNone(swarm._FIREFOX_SPARE)
+
+    def test_lease_reuses_reset_context_and_drops_popups(self) -> None:
+        chromium = FakeBrowserType()
+        p = types.SimpleNamespace(chromium=chromium, firefox=FakeBrowserType())
+
+        async def scenario() -> tuple[tuple[object, object], tuple[object, object]]:
+            pool = await swarm.BrowserPool(p, headful=False, size=1).start()
+            async with pool.lease() as first:
+                await first[1].goto("https://jobs.example.com/apply")
+                await first[0].new_page()  # popup opened during the flow
+            async with pool.lease() as second:
+                pass
+            await pool.close()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertIs(first[0], second[0])
+        self.assertIs(first[1], second[1])
+        self.assertEqual(len(first[0].pages), 1)
+        self.assertEqual(first[0].cookie_clears, 2)
+        self.assertEqual(first[0].permission_clears, 2)
+        self.assertEqual(first[1].storage_clears, 1)
+        self.assertEqual(first[1].url, "about:blank")
+        self.assertEqual(len(chromium.launched[0].contexts), 1)
+        self.assertIs(first[0].routed, swarm.BLOCKED_URL_RE)
+
+    def test_lease_without_cdp_drops_context_that_saw_several_origins(self) -> None:
+        chromium = FakeBrowserType()
+        p = types.SimpleNamespace(chromium=chromium, firefox=FakeBrowserType())
+
+        async def scenario() -> tuple[object, object]:
+            pool = await swarm.BrowserPool(p, headful=False, size=1).start()
+            async with pool.lease() as (first, page):
+                await page.goto("https://careers.example.com/jobs")
+                await page.goto("https://boards.ats.example/apply")
+            async with pool.lease() as (second, _):
+                pass
+            await pool.close()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+
+class AdmissionTests(unittest.TestCase):
+    def test_blocks_shrink_the_cap_and_completions_restore_it(self) -> None:
+        async def scenario() -> list[int]:
+            admission = swarm.Admission(2)
+            await admission.feedback({"status": "BLOCKED"})
+            seen = []
+
+            async def job() -> None:
+                async with admission.slot():
+                    seen.append(admission.active)
+                    await asyncio.sleep(0.01)
+
+            await asyncio.gather(job(), job())
+            await admission.feedback({"status": "INCOMPLETE", "detail": "timeout_300s_no_confirmation"})
+            await admission.feedback({"status": "COMPLETE"})
+            await admission.feedback({"status": "COMPLETE"})
+            await asyncio.gather(job(), job())
+            return seen + [admission.limit]
+
+        self.assertEqual(asyncio.run(scenario()), [1, 1, 1, 2, 2])
+
+    def test_complete_with_timeout_detail_does_not_shrink_the_cap(self) -> None:
+        async def scenario() -> int:
+            admission = swarm.Admission(2)
+            await admission.feedback({"status": "COMPLETE", "detail": "timeout_with_strict_confirmation"})
+            return admission.limit
+
+        self.assertEqual(asyncio.run(scenario()), 2)
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.main_frame = object()
+        self.handlers: dict[str, object] = {}
+        self.queries = 0
+
+    def on(self, event: str, handler: object) -> None:
+        self.handlers[event] = handler
+
+    def locator(self, selector: str) -> tuple[str, int]:
+        self.queries += 1
+        return (selector, self.queries)
+
+
+class SelectorCacheTests(unittest.TestCase):
+    def test_locators_are_reused_until_main_frame_navigates(self) -> None:
+        cache = swarm.SelectorCache()
+        page = FakePage()
+
+        first = cache.locator(page, "textarea")
+        self.assertIs(cache.locator(page, "textarea"), first)
+        page.handlers["framenavigated"](object())
+        self.assertIs(cache.locator(page, "textarea"), first)
+        page.handlers["framenavigated"](page.main_frame)
+        self.assertIsNot(cache.locator(page, "textarea"), first)
+
+        other = FakePage()
+        self.assertEqual(cache.locator(other, "textarea"), ("textarea", 1))
+
+
+class DiskFlusherTests(unittest.TestCase):
+    def test_queued_writes_land_on_disk_when_flusher_exits(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+
+            async def scenario() -> bool:
+                async with swarm.disk_flusher():
+                    swarm.queue_write(root / "logs" / "a.json", b"{}")
+                    swarm.queue_write(root / "source" / "b.html.gz", b"<html></html>")
+                    return (root / "logs" / "a.json").exists()
+
+            written_early = asyncio.run(scenario())
+
+            self.assertFalse(written_early)
+            self.assertEqual((root / "logs" / "a.json").read_bytes(), b"{}")
+            self.assertEqual(gzip.decompress((root / "source" / "b.html.gz").read_bytes()), b"<html></html>")
+            self.assertIsNone(swarm._WRITE_Q)
+
+
+# Just enough DOM for the helper to load in node; dialogs carry their text and one button
+NODE_DOM_STUB = r"""
+const clicked = [];
+const button = (text) => ({ innerText: text, parentElement: null, getClientRects: () => [{}], click() { clicked.push(text); } });
+const dialog = (text, btn) => ({ innerText: text, getClientRects: () => [{}], querySelectorAll: () => [button(btn)] });
+const dialogs = [];
+const buttons = [];
+const observers = [];
+const listeners = {};
+const mutate = () => observers.forEach(cb => cb([]));
+globalThis.MutationObserver = class { constructor(cb) { observers.push(cb); } observe() {} };
+globalThis.HTMLInputElement = class { set value(v) {} };
+globalThis.document = {
+  querySelectorAll: (sel) => sel === 'button' ? buttons : sel.includes('dialog') ? dialogs : [],
+  addEventListener: (type, fn) => { listeners[type] = fn; },
+};
+globalThis.window = globalThis;
+"""
+
+
+@unittest.skipUnless(shutil.which("node"), "node not installed")
+class InjectedHelperTests(unittest.TestCase):
+    def run_helper(self, body: str) -> object:
+        script = NODE_DOM_STUB + swarm.INJECT_HELPER_JS + "const S = window.__SWM2__;\n" + body
+        out = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+        return json.loads(out.stdout)
+
+    def run_dismiss(self, dialogs: list[tuple[str, str]], call: str) -> object:
+        return self.run_helper(
+            "".join(f"dialogs.push(dialog({json.dumps(t)}, {json.dumps(b)}));\n" for t, b in dialogs)
+            + call + "; console.log(JSON.stringify(clicked));"
+        )
+
+    def test_dialog_with_strict_marker_is_left_alone(self) -> None:
+        clicked = self.run_dismiss(
+            [
+                ("Application complete.\n  Your Application Number is 4821", "OK"),
+                ("Your session is about to expire", "Close"),
+            ],
+            f"S.dismissDialogs({json.dumps(list(swarm.DISMISS_HINTS))})",
+        )
+
+        self.assertEqual(clicked, ["Close"])
+
+    def test_reactive_janitor_never_dismisses_dialogs(self) -> None:
+        clicked = self.run_dismiss([("Step 2 of 4: upload your resume", "Close")], "S.janitor()")
+
+        self.assertEqual(clicked, [])
+
+    def test_popup_without_aria_role_is_dismissed_by_its_button(self) -> None:
+        clicked = self.run_dismiss(
+            [],
+            "buttons.push(button('Book a call'), button(' OK '));\n"
+            f"S.dismissDialogs({json.dumps(list(swarm.DISMISS_HINTS))})",
+        )
+
+        self.assertEqual(clicked, [" OK "])
+
+    def test_quiet_after_a_click_needs_a_mutation_after_it(self) -> None:
+        states = self.run_helper(
+            "const out = [S.quietFor(0)];\n"
+            "listeners.click();\n"
+            "out.push(S.quietFor(0));\n"
+            "mutate();\n"
+            "out.push(S.quietFor(0));\n"
+            "console.log(JSON.stringify(out)); process.exit(0);"
+        )
+
+        self.assertEqual(states, [True, False, True])
+
+
 if __name__ == "__main__":
     unittest.main()